@@ -1,37 +1,104 @@
 from __future__ import annotations
 import logging
 import shutil
+from functools import partial
 from pathlib import Path
-from homeassistant.core import HomeAssistant
+from typing import TYPE_CHECKING
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from .const import (
     DOMAIN,
     PLATFORMS,
     CONF_REGION,
     CONF_QUEUE,
+    CONF_BLACKOUT_WINDOWS,
+    CONF_END,
+    CONF_EVENT_LEAD_TIMES,
+    CONF_MAX_FETCHES_PER_DAY,
+    CONF_MAX_FETCHES_PER_HOUR,
+    CONF_MIRRORS,
+    CONF_PUSH,
+    CONF_PUSH_URL,
+    CONF_RECORD_DIR,
+    CONF_SHARED_CACHE,
+    CONF_SHARED_CACHE_MAX_AGE,
+    CONF_START,
+    DEFAULT_BLACKOUT_WINDOWS,
+    DEFAULT_PUSH_URL,
     DEFAULT_SCAN_INTERVAL,
+    REGIONS,
 )
-from .coordinator import SvitloCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import SvitloCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Глобальні (на весь HA) налаштування хабу; регіон/черга — лише через config flow
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_PUSH, default=False): cv.boolean,
+                vol.Optional(CONF_PUSH_URL, default=DEFAULT_PUSH_URL): cv.url,
+                vol.Optional(CONF_RECORD_DIR): cv.string,
+                # Додаткові дзеркала проксі (основний API_URL лишається першим)
+                vol.Optional(CONF_MIRRORS, default=[]): vol.All(cv.ensure_list, [cv.url]),
+                # Файл-кеш JSON, спільний для кількох інстансів HA на одному хості
+                vol.Optional(CONF_SHARED_CACHE): cv.string,
+                vol.Optional(
+                    CONF_SHARED_CACHE_MAX_AGE, default=DEFAULT_SCAN_INTERVAL
+                ): cv.positive_int,
+                # За скільки хвилин до початку/кінця відключення слати події
+                vol.Optional(CONF_EVENT_LEAD_TIMES, default=[]): vol.All(
+                    cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=0, max=24 * 60))]
+                ),
+                # Бюджет запитів до проксі на весь HA
+                vol.Optional(CONF_MAX_FETCHES_PER_HOUR): cv.positive_int,
+                vol.Optional(CONF_MAX_FETCHES_PER_DAY): cv.positive_int,
+                vol.Optional(CONF_BLACKOUT_WINDOWS, default=DEFAULT_BLACKOUT_WINDOWS): vol.All(
+                    cv.ensure_list,
+                    [vol.Schema({vol.Required(CONF_START): cv.time, vol.Required(CONF_END): cv.time})],
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the Svitlo Live component."""
+    # Модулі підвантажуємо тут, а не при імпорті пакета — швидший старт HA
+    from .ics import async_register_ics_view
+    from .outage_statistics import async_setup_outage_statistics
+    from .services import async_register_services
+    from .websocket import async_register_websocket
+
+    hass.data.setdefault(DOMAIN, {})["_config"] = config.get(DOMAIN) or {}
     # Копіюємо blueprints при першому завантаженні компонента
     await hass.async_add_executor_job(_copy_blueprints, hass)
+    async_register_websocket(hass)
+    async_setup_outage_statistics(hass)
+    async_register_services(hass)
+    async_register_ics_view(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Svitlo.live v2 from a config entry."""
+    from .coordinator import SvitloCoordinator
+
     hass.data.setdefault(DOMAIN, {})
     
     # Фіксований інтервал опитування (15 хв)
     config = {
         CONF_REGION: entry.data[CONF_REGION],
         CONF_QUEUE: entry.data[CONF_QUEUE],
+        "entry_id": entry.entry_id,
         "scan_interval_seconds": DEFAULT_SCAN_INTERVAL,
     }
     
@@ -39,6 +106,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await coordinator.async_config_entry_first_refresh()
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    _ensure_push(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
@@ -47,12 +116,96 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload Svitlo.live v2 entry."""
+    from .coordinator import async_get_coordinators
+
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        coordinator = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.async_shutdown()
+        if not async_get_coordinators(hass):
+            shared = hass.data[DOMAIN].get("_shared_api") or {}
+            push = shared.get("push")
+            if push is not None:
+                shared["push"] = None
+                await push.async_stop()
+            file_cache = shared.get("file_cache")
+            if file_cache is not None:
+                await file_cache.async_close()
     return unload_ok
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Нова черга з options flow: перев'язуємо координатор і реєстри без reload і фетчу."""
+    region = entry.options.get(CONF_REGION)
+    queue = entry.options.get(CONF_QUEUE)
+    coordinator: SvitloCoordinator | None = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if not region or not queue or coordinator is None:
+        return
+
+    old_region, old_queue = coordinator.region, coordinator.queue
+    if (region, queue) != (old_region, old_queue):
+        _migrate_registries(hass, entry, f"{old_region}_{old_queue}", region, queue)
+        await coordinator.async_rebind(region, queue)
+        _LOGGER.info(
+            "Svitlo Live entry %s switched %s/%s -> %s/%s without reload",
+            entry.entry_id, old_region, old_queue, region, queue,
+        )
+
+    # Нова черга переходить у data (як при створенні entry); options очищуємо.
+    # Повторний виклик listener'а після цього оновлення нічого не робить
+    hass.config_entries.async_update_entry(
+        entry,
+        data={**entry.data, CONF_REGION: region, CONF_QUEUE: queue},
+        options={},
+        title=f"{REGIONS.get(region, region)} / {queue}",
+        unique_id=f"{region}_{queue}",
+    )
+
+
+@callback
+def _migrate_registries(
+    hass: HomeAssistant, entry: ConfigEntry, old_key: str, region: str, queue: str
+) -> None:
+    """unique_id ентіті та identifiers пристрою: суфікс `<region>_<queue>` -> новий."""
+    new_key = f"{region}_{queue}"
+    ent_reg = er.async_get(hass)
+    for reg_entry in er.async_entries_for_config_entry(ent_reg, entry.entry_id):
+        if reg_entry.unique_id.endswith(f"_{old_key}"):
+            new_unique_id = reg_entry.unique_id[: -len(old_key)] + new_key
+            ent_reg.async_update_entity(reg_entry.entity_id, new_unique_id=new_unique_id)
+
+    dev_reg = dr.async_get(hass)
+    device = dev_reg.async_get_device(identifiers={(DOMAIN, old_key)})
+    if device is None:
+        return
+    # Ім'я від користувача (name_by_user) зберігається окремо й не зачіпається
+    dev_reg.async_update_device(
+        device.id,
+        new_identifiers={(DOMAIN, new_key)},
+        model=f"Queue {queue}",
+        name=f"Svitlo • {region} / {queue}",
+    )
+
+
+def _ensure_push(hass: HomeAssistant) -> None:
+    """Один push-слухач на весь HA, якщо його увімкнено в YAML."""
+    from .coordinator import async_apply_shared_json
+    from .push import SvitloPushListener
+
+    conf = hass.data[DOMAIN].get("_config") or {}
+    shared = hass.data[DOMAIN]["_shared_api"]
+    if not conf.get(CONF_PUSH) or shared.get("push") is not None:
+        return
+    push = SvitloPushListener(
+        hass,
+        conf.get(CONF_PUSH_URL, DEFAULT_PUSH_URL),
+        partial(async_apply_shared_json, hass),
+    )
+    shared["push"] = push
+    push.start()
+
+
 def _copy_blueprints(hass: HomeAssistant) -> None:
     """Copy blueprints to the Home Assistant blueprints directory."""
     try:
@@ -24,6 +24,11 @@ class SvitloBaseEntity(CoordinatorEntity):
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator)
 
+    @property
+    def unique_id(self) -> str:
+        # Черга може змінитися на льоту (options flow) — ID завжди з координатора
+        return f"{self._unique_prefix}_{self.coordinator.region}_{self.coordinator.queue}"
+
     @property
     def device_info(self) -> dict[str, Any]:
         region = getattr(self.coordinator, "region", "region")
@@ -50,17 +55,17 @@ class SvitloElectricityStatusBinary(SvitloBaseEntity, BinarySensorEntity):
 
     def __init__(self, coordinator, entry: ConfigEntry) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"{entry.entry_id}_power_{coordinator.region}_{coordinator.queue}"
+        self._unique_prefix = f"{entry.entry_id}_power"
 
     @property
     def is_on(self) -> bool | None:
-        data = getattr(self.coordinator, "data", None)
+        snap = self.coordinator.data
 
         # Якщо даних немає або останнє оновлення неуспішне — Unknown
-        if not data or not getattr(self.coordinator, "last_update_success", False):
+        if snap is None or not self.coordinator.last_update_success:
             return None
 
-        val = data.get("now_status")
+        val = snap.now_status
         # Логіка:
         # - 'off'  -> False (відключення)
         # - 'on' або 'nosched' (немає графіка) -> True
@@ -73,9 +78,11 @@ class SvitloElectricityStatusBinary(SvitloBaseEntity, BinarySensorEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        d = getattr(self.coordinator, "data", {}) or {}
+        snap = self.coordinator.data
+        if snap is None:
+            return {"next_change_at": None, "queue": None, "status_raw": None}
         return {
-            "next_change_at": d.get("next_change_at"),
-            "queue": d.get("queue"),
-            "status_raw": d.get("now_status"),
+            "next_change_at": snap.next_change_at,
+            "queue": snap.queue,
+            "status_raw": snap.now_status,
         }
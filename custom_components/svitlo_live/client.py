@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import json
+import logging
+import statistics
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util import ssl as ssl_util
+
+from .const import OFFLOAD_THRESHOLD_BYTES
+from .wire import PACKED_CONTENT_TYPE, decode_json, decode_packed, slot_map
+
+_LOGGER = logging.getLogger(__name__)
+
+# Таймаути запиту до дзеркала (сек): весь запит / з'єднання / тиша між пакетами
+REQUEST_TIMEOUT = 30
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 20
+
+# Власний пул з'єднань до проксі: keep-alive між опитуваннями та кешований DNS.
+# Два з'єднання на хост — щоб хедж на те саме дзеркало не чекав у черзі пулу
+POOL_LIMIT_PER_HOST = 2
+KEEPALIVE_SECONDS = 120
+DNS_CACHE_SECONDS = 600
+
+# brotli aiohttp розпаковує лише з установленим brotli/brotlicffi
+_ACCEPT_ENCODING = (
+    "br, gzip, deflate"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip, deflate"
+)
+
+# Компактний SVP1 — якщо проксі його вміє, інакше звичайний JSON
+ACCEPT_PACKED = f"{PACKED_CONTENT_TYPE}, application/json;q=0.9"
+ACCEPT_JSON = "application/json"
+
+# Скільки останніх замірів латентності тримаємо на дзеркало
+LATENCY_WINDOW = 20
+
+# Оцінка для дзеркала без замірів і межі затримки хеджування (сек)
+DEFAULT_LATENCY = 1.0
+HEDGE_DEFAULT_DELAY = 2.0
+HEDGE_MIN_DELAY = 0.3
+HEDGE_MAX_DELAY = 5.0
+HEDGE_PERCENTILE = 90
+HEDGE_MIN_SAMPLES = 5
+
+
+@callback
+def async_create_proxy_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Окрема сесія для проксі з власним пулом з'єднань і трасуванням фаз запиту.
+
+    Закривається разом із HA.
+    """
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_util.get_default_context(),
+        limit_per_host=POOL_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_SECONDS,
+        ttl_dns_cache=DNS_CACHE_SECONDS,
+        use_dns_cache=True,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=REQUEST_TIMEOUT, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+        ),
+        headers={"User-Agent": SERVER_SOFTWARE, "Accept-Encoding": _ACCEPT_ENCODING},
+        trace_configs=[_timing_trace()],
+    )
+
+    async def _async_close(_event: Event) -> None:
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return session
+
+
+def _timing_trace() -> aiohttp.TraceConfig:
+    """Пише тривалості фаз (dns/connect/ttfb, сек) у dict з trace_request_ctx."""
+
+    def _phases(ctx: SimpleNamespace) -> Optional[dict[str, Any]]:
+        return ctx.trace_request_ctx if isinstance(ctx.trace_request_ctx, dict) else None
+
+    async def _request_start(_session, ctx, _params) -> None:
+        ctx.started = time.monotonic()
+
+    async def _dns_start(_session, ctx, _params) -> None:
+        ctx.dns_started = time.monotonic()
+
+    async def _dns_end(_session, ctx, _params) -> None:
+        if (phases := _phases(ctx)) is not None:
+            phases["dns"] = round(time.monotonic() - ctx.dns_started, 4)
+
+    async def _dns_hit(_session, ctx, _params) -> None:
+        if (phases := _phases(ctx)) is not None:
+            phases["dns"] = 0.0
+
+    async def _connect_start(_session, ctx, _params) -> None:
+        ctx.connect_started = time.monotonic()
+
+    async def _connect_end(_session, ctx, _params) -> None:
+        if (phases := _phases(ctx)) is not None:
+            phases["connect"] = round(time.monotonic() - ctx.connect_started, 4)
+            phases["reused"] = False
+
+    async def _connection_reused(_session, ctx, _params) -> None:
+        if (phases := _phases(ctx)) is not None:
+            phases["connect"] = 0.0
+            phases["reused"] = True
+
+    async def _request_end(_session, ctx, _params) -> None:
+        # Заголовки відповіді отримано — time to first byte від старту запиту
+        if (phases := _phases(ctx)) is not None:
+            phases["ttfb"] = round(time.monotonic() - ctx.started, 4)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_request_start)
+    trace.on_dns_resolvehost_start.append(_dns_start)
+    trace.on_dns_resolvehost_end.append(_dns_end)
+    trace.on_dns_cache_hit.append(_dns_hit)
+    trace.on_connection_create_start.append(_connect_start)
+    trace.on_connection_create_end.append(_connect_end)
+    trace.on_connection_reuseconn.append(_connection_reused)
+    trace.on_request_end.append(_request_end)
+    return trace
+
+
+class _Mirror:
+    __slots__ = ("url", "samples", "last_phases", "packed")
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.samples: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        # Фази останнього успішного запиту: dns/connect/ttfb/body (сек), reused, size
+        self.last_phases: dict[str, Any] = {}
+        # Чи просити SVP1; вимикається, якщо дзеркало віддало битий SVP1
+        self.packed = True
+
+    def estimate(self) -> float:
+        return statistics.median(self.samples) if self.samples else DEFAULT_LATENCY
+
+    def hedge_delay(self) -> float:
+        """Перцентиль латентності — скільки чекати, перш ніж дублювати запит."""
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        ordered = sorted(self.samples)
+        pos = min(len(ordered) - 1, (len(ordered) * HEDGE_PERCENTILE) // 100)
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, ordered[pos]))
+
+
+class SvitloClient:
+    """Клієнт проксі з дзеркалами: запит іде на найшвидше дзеркало, а якщо воно
+    не відповіло за перцентильну затримку (або впало) — паралельно на наступне.
+    Перемагає перша валідна відповідь."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        urls: list[str],
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one API URL is required")
+        self.hass = hass
+        self._session = session or async_create_proxy_session(hass)
+        self._mirrors = [_Mirror(url) for url in dict.fromkeys(urls)]
+
+        # Остання повна версія документа — база для дельта-синхронізації
+        self._document: Optional[dict[str, Any]] = None
+        self._version: Optional[str] = None
+
+        # Скільки байтів прийшло в останній відповіді: повне тіло, патч або 0 для 304
+        self.last_body_size = 0
+        # Розмір поточного повного документа (для рішення про executor). Після патча —
+        # оцінка за кількістю діб у документі й байтами на добу з останнього повного тіла
+        self.document_size = 0
+        self._bytes_per_day = 0.0
+
+    def latency_stats(self) -> dict[str, Optional[float]]:
+        """url -> медіана латентності (сек) або None, якщо замірів ще нема."""
+        return {
+            m.url: round(statistics.median(m.samples), 3) if m.samples else None
+            for m in self._mirrors
+        }
+
+    def timing_stats(self) -> dict[str, dict[str, Any]]:
+        """url -> фази останнього успішного запиту до дзеркала."""
+        return {m.url: dict(m.last_phases) for m in self._mirrors if m.last_phases}
+
+    def _ranked(self) -> list[_Mirror]:
+        # sorted стабільний: за рівних оцінок зберігається порядок із конфігу
+        return sorted(self._mirrors, key=lambda m: m.estimate())
+
+    async def async_fetch_json(self) -> dict[str, Any]:
+        """Актуальний документ: дельта від відомої версії, інакше повний фетч."""
+        if self._document is not None and self._version is not None:
+            try:
+                return await self._async_fetch_delta(self._document, self._version)
+            except _DeltaMismatch as e:
+                _LOGGER.debug("Delta sync fell back to full fetch: %s", e)
+
+        document = await self._hedged_get(None)
+        if document is None or document.get("type") == "patch":
+            raise RuntimeError("Proxy answered a full fetch without a full document")
+        self._remember(document, full=True)
+        return document
+
+    async def _async_fetch_delta(self, base: dict[str, Any], version: str) -> dict[str, Any]:
+        answer = await self._hedged_get({"since": version})
+        if answer is None:
+            # 304 — з нашої версії нічого не змінилось
+            return base
+        if answer.get("type") != "patch":
+            # Проксі вирішив віддати повний документ
+            self._remember(answer, full=True)
+            return answer
+        if answer.get("base_version") != version:
+            raise _DeltaMismatch(f"base {answer.get('base_version')} != local {version}")
+
+        document = apply_patch(base, answer)
+        self._remember(document, full=False)
+        _LOGGER.debug(
+            "Delta sync %s -> %s: %d queue(s) changed",
+            version, document.get("version"), len(answer.get("changes") or []),
+        )
+        return document
+
+    def _remember(self, document: dict[str, Any], full: bool) -> None:
+        days = _day_count(document)
+        if full:
+            self.document_size = self.last_body_size
+            self._bytes_per_day = self.last_body_size / max(1, days)
+        else:
+            self.document_size = round(self._bytes_per_day * days)
+        self._document = document
+        version = document.get("version")
+        self._version = str(version) if version is not None else None
+
+    async def _hedged_get(self, params: Optional[dict[str, str]]) -> Optional[dict[str, Any]]:
+        ranked = self._ranked()
+        delay = ranked[0].hedge_delay()
+        tasks: dict[asyncio.Task, _Mirror] = {}
+        last_error: Optional[BaseException] = None
+        next_idx = 0
+
+        def _launch() -> None:
+            nonlocal next_idx
+            mirror = ranked[next_idx]
+            next_idx += 1
+            tasks[asyncio.create_task(self._fetch_one(mirror, params))] = mirror
+
+        _launch()
+        pending = set(tasks)
+        try:
+            while pending:
+                can_hedge = next_idx < len(ranked)
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if task.exception() is None:
+                        mirror = tasks[task]
+                        if len(tasks) > 1:
+                            _LOGGER.debug("Hedged fetch won by %s", mirror.url)
+                        return task.result()
+                    last_error = task.exception()
+                    _LOGGER.debug("Mirror %s failed: %s", tasks[task].url, last_error)
+
+                # Тайм-аут хеджування або помилка — підключаємо наступне дзеркало
+                if can_hedge:
+                    _launch()
+                    pending |= {t for t in tasks if not t.done()}
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            # Дочікуємося скасування: з'єднання повертаються в пул, а задачі
+            # не лишаються висіти з непрочитаними винятками
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+        raise last_error or RuntimeError("No API mirror answered")
+
+    async def _fetch_one(
+        self, mirror: _Mirror, params: Optional[dict[str, str]]
+    ) -> Optional[dict[str, Any]]:
+        started = time.monotonic()
+        phases: dict[str, Any] = {}
+        try:
+            try:
+                data, body = await self._request(mirror, params, phases)
+            except _InvalidPacked as e:
+                # Це ж дзеркало одразу перепитуємо в JSON — поточне оновлення не падає
+                mirror.packed = False
+                _LOGGER.warning("Invalid SVP1 from %s, retrying as JSON: %s", mirror.url, e)
+                phases = {}
+                data, body = await self._request(mirror, params, phases)
+            if data is not None and not _is_valid_answer(data):
+                raise ValueError(f"Invalid schedule document from {mirror.url}")
+        except asyncio.CancelledError:
+            # Програв гонку: відомо лише, що дзеркало повільніше за цей час
+            mirror.samples.append(time.monotonic() - started)
+            raise
+        except Exception:
+            mirror.samples.append(REQUEST_TIMEOUT)
+            raise
+        mirror.samples.append(time.monotonic() - started)
+        mirror.last_phases = phases
+        _LOGGER.debug("Fetch %s phases: %s", mirror.url, phases)
+        self.last_body_size = len(body)
+        return data
+
+    async def _request(
+        self, mirror: _Mirror, params: Optional[dict[str, str]], phases: dict[str, Any]
+    ) -> tuple[Optional[dict[str, Any]], bytes]:
+        """Один HTTP-запит до дзеркала: (розібрана відповідь або None для 304, тіло)."""
+        async with self._session.get(
+            mirror.url,
+            params=params,
+            headers={"Accept": ACCEPT_PACKED if mirror.packed else ACCEPT_JSON},
+            trace_request_ctx=phases,
+        ) as resp:
+            if resp.status == 304 and params:
+                return None, b""
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status} for {mirror.url}")
+            body_started = time.monotonic()
+            body = await resp.read()
+            phases["body"] = round(time.monotonic() - body_started, 4)
+            phases["size"] = len(body)  # уже розпакований
+            phases["encoding"] = resp.headers.get("Content-Encoding", "identity")
+            phases["format"] = "svp1" if resp.content_type == PACKED_CONTENT_TYPE else "json"
+            return await self._decode(body, resp.content_type), body
+
+    async def _decode(self, body: bytes, content_type: str) -> Any:
+        decoder = decode_json  # orjson + слоти в рядки кодів
+        if content_type == PACKED_CONTENT_TYPE:
+            decoder = decode_packed
+        # Великі документи декодуємо поза event loop
+        try:
+            if len(body) >= OFFLOAD_THRESHOLD_BYTES:
+                return await self.hass.async_add_executor_job(decoder, body)
+            return decoder(body)
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            if decoder is decode_packed:
+                raise _InvalidPacked(str(e)) from e
+            raise
+
+
+class _DeltaMismatch(Exception):
+    """Патч не лягає на локальну версію — потрібен повний фетч."""
+
+
+class _InvalidPacked(ValueError):
+    """Дзеркало віддало битий SVP1 — перепитуємо його в JSON."""
+
+
+def _is_valid_answer(data: Any) -> bool:
+    if not isinstance(data, dict):
+        return False
+    if data.get("type") == "patch":
+        return isinstance(data.get("changes"), list)
+    return isinstance(data.get("regions"), list)
+
+
+def _day_count(document: dict[str, Any]) -> int:
+    """Скільки діб (черга × дата) у документі — розмір росте пропорційно їм."""
+    return sum(
+        len(per_date)
+        for region in document.get("regions", [])
+        for per_date in (region.get("schedule") or {}).values()
+    )
+
+
+def _queues_checksum(document: dict[str, Any], keys: list[tuple[str, str]]) -> str:
+    """sha256 канонічного JSON змінених черг після застосування патча."""
+    regions = {r.get("cpu"): r for r in document.get("regions", [])}
+    payload: dict[str, Any] = {}
+    for cpu, queue in sorted(keys):
+        per_date = ((regions.get(cpu) or {}).get("schedule") or {}).get(queue)
+        # Проксі рахує суму по JSON-формі — SVP1-рядки розгортаємо назад у {"HH:MM": код}
+        payload[f"{cpu}/{queue}"] = (
+            {day: slot_map(slots) for day, slots in per_date.items()}
+            if per_date is not None
+            else None
+        )
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def apply_patch(base: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
+    """Застосовує патч проксі до документа copy-on-write (base не змінюється).
+
+    changes: [{"cpu": ..., "queue": ..., "dates": {iso_date: slots | null}}]
+    """
+    document = {k: v for k, v in base.items() if k != "regions"}
+    for key in ("date_today", "date_tomorrow", "version"):
+        if key in patch:
+            document[key] = patch[key]
+
+    regions = list(base.get("regions", []))
+    index = {r.get("cpu"): i for i, r in enumerate(regions)}
+    touched: list[tuple[str, str]] = []
+    copied: set[str] = set()
+
+    for change in patch["changes"]:
+        cpu, queue = change.get("cpu"), change.get("queue")
+        if cpu not in index or not queue:
+            raise _DeltaMismatch(f"Unknown region/queue in patch: {cpu}/{queue}")
+        i = index[cpu]
+        if cpu not in copied:
+            region = dict(regions[i])
+            region["schedule"] = dict(region.get("schedule") or {})
+            regions[i] = region
+            copied.add(cpu)
+        schedule = regions[i]["schedule"]
+        per_date = dict(schedule.get(queue) or {})
+        for day, slots in (change.get("dates") or {}).items():
+            if slots is None:
+                per_date.pop(day, None)
+            else:
+                per_date[day] = slots
+        schedule[queue] = per_date
+        touched.append((cpu, queue))
+
+    document["regions"] = regions
+    expected = patch.get("checksum")
+    if expected and _queues_checksum(document, touched) != expected:
+        raise _DeltaMismatch("checksum mismatch after applying patch")
+    return document
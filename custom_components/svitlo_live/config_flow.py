@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Tuple
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -8,10 +9,25 @@ from homeassistant.helpers.selector import selector
 
 from .const import DOMAIN, CONF_REGION, CONF_QUEUE, REGIONS, REGION_QUEUE_MODE
 
-REGION_SLUG_TO_UI: Dict[str, str] = dict(sorted(REGIONS.items(), key=lambda kv: kv[1]))
-REGION_UI_TO_SLUG: Dict[str, str] = {v: k for k, v in REGION_SLUG_TO_UI.items()}
-REGION_UI_LIST: List[str] = list(REGION_SLUG_TO_UI.values())
-REGION_UI_OPTIONS = [{"label": name, "value": name} for name in REGION_UI_LIST]
+class _RegionTables(NamedTuple):
+    slug_to_ui: Dict[str, str]
+    ui_to_slug: Dict[str, str]
+    ui_list: List[str]
+    ui_options: List[Dict[str, str]]
+
+
+@lru_cache(maxsize=1)
+def _region_tables() -> _RegionTables:
+    """Таблиці регіонів для форм — будуються при першому відкритті flow, не при імпорті."""
+    slug_to_ui = dict(sorted(REGIONS.items(), key=lambda kv: kv[1]))
+    ui_list = list(slug_to_ui.values())
+    return _RegionTables(
+        slug_to_ui=slug_to_ui,
+        ui_to_slug={v: k for k, v in slug_to_ui.items()},
+        ui_list=ui_list,
+        ui_options=[{"label": name, "value": name} for name in ui_list],
+    )
+
 
 def _queue_options_for_region(region_slug: str) -> Tuple[List[str], List[Dict[str, str]], str]:
     mode = REGION_QUEUE_MODE.get(region_slug, "DEFAULT")
@@ -39,10 +55,11 @@ class SvitloConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._region_ui = user_input[CONF_REGION]
             return await self.async_step_details()
 
-        default_region = REGION_UI_LIST[0] if REGION_UI_LIST else "Київська область"
+        tables = _region_tables()
+        default_region = tables.ui_list[0] if tables.ui_list else "Київська область"
         data_schema = vol.Schema({
             vol.Required(CONF_REGION, default=default_region): selector({
-                "select": {"options": REGION_UI_OPTIONS, "mode": "dropdown"}
+                "select": {"options": tables.ui_options, "mode": "dropdown"}
             })
         })
         return self.async_show_form(step_id="user", data_schema=data_schema)
@@ -52,7 +69,7 @@ class SvitloConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return await self.async_step_user(user_input=None)
 
         region_ui = self._region_ui
-        region_slug = REGION_UI_TO_SLUG.get(region_ui, region_ui)
+        region_slug = _region_tables().ui_to_slug.get(region_ui, region_ui)
         _, queue_options, default_queue = _queue_options_for_region(region_slug)
 
         if user_input is not None:
@@ -77,8 +94,9 @@ class SvitloConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={"region": region_ui},  # ← додано
         )
 
+    @staticmethod
     @callback
-    def async_get_options_flow(self, config_entry):
+    def async_get_options_flow(config_entry):
         return SvitloOptionsFlow(config_entry)
 
 class SvitloOptionsFlow(config_entries.OptionsFlow):
@@ -88,7 +106,8 @@ class SvitloOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None):
         saved_slug = self.entry.data.get(CONF_REGION)
-        current_region_ui = REGION_SLUG_TO_UI.get(saved_slug, REGION_UI_LIST[0])
+        tables = _region_tables()
+        current_region_ui = tables.slug_to_ui.get(saved_slug, tables.ui_list[0])
 
         if user_input is not None:
             self._region_ui = user_input[CONF_REGION]
@@ -96,7 +115,7 @@ class SvitloOptionsFlow(config_entries.OptionsFlow):
 
         data_schema = vol.Schema({
             vol.Required(CONF_REGION, default=current_region_ui): selector({
-                "select": {"options": REGION_UI_OPTIONS, "mode": "dropdown"}
+                "select": {"options": tables.ui_options, "mode": "dropdown"}
             })
         })
         return self.async_show_form(step_id="init", data_schema=data_schema)
@@ -106,7 +125,7 @@ class SvitloOptionsFlow(config_entries.OptionsFlow):
             return await self.async_step_init(user_input=None)
 
         region_ui = self._region_ui
-        region_slug = REGION_UI_TO_SLUG.get(region_ui, region_ui)
+        region_slug = _region_tables().ui_to_slug.get(region_ui, region_ui)
 
         saved_queue = self.entry.data.get(CONF_QUEUE)
         q_values, q_options, q_default = _queue_options_for_region(region_slug)
@@ -114,8 +133,17 @@ class SvitloOptionsFlow(config_entries.OptionsFlow):
 
         if user_input is not None:
             queue = user_input[CONF_QUEUE]
-            new_data = {**self.entry.data, CONF_REGION: region_slug, CONF_QUEUE: queue}
-            return self.async_create_entry(title="", data=new_data, options=self.entry.options)
+            unique_id = f"{region_slug}_{queue}"
+            if any(
+                e.unique_id == unique_id and e.entry_id != self.entry.entry_id
+                for e in self.hass.config_entries.async_entries(DOMAIN)
+            ):
+                return self.async_abort(reason="already_configured")
+            # Нова черга йде в options; update listener застосовує її на льоту
+            # і переносить у data (див. __init__._async_update_listener)
+            return self.async_create_entry(
+                title="", data={CONF_REGION: region_slug, CONF_QUEUE: queue}
+            )
 
         data_schema = vol.Schema({
             vol.Required(CONF_QUEUE, default=default_queue): selector({
@@ -1,3 +1,5 @@
+from datetime import time
+
 from homeassistant.const import Platform
 
 DOMAIN = "svitlo_live"
@@ -51,3 +53,41 @@ REGION_QUEUE_MODE = {
 
 # Публічний URL твого Cloudflare Worker (без секретів)
 API_URL = "https://svitlo-proxy.svitlo-proxy.workers.dev"
+
+# Горизонт сенсора «хвилин відключень у найближчі N год»
+OUTAGE_HORIZON_HOURS = 6
+
+# Від такого розміру відповіді (байт) декодування JSON і побудова payload
+# виконуються в executor, щоб не блокувати event loop HA
+OFFLOAD_THRESHOLD_BYTES = 256 * 1024
+
+# Необов'язкове YAML-налаштування хабу (`svitlo_live:` у configuration.yaml)
+CONF_PUSH = "push"
+CONF_PUSH_URL = "push_url"
+CONF_RECORD_DIR = "record_dir"
+CONF_MIRRORS = "mirrors"
+CONF_SHARED_CACHE = "shared_cache"
+CONF_SHARED_CACHE_MAX_AGE = "shared_cache_max_age"
+CONF_EVENT_LEAD_TIMES = "event_lead_times"
+CONF_MAX_FETCHES_PER_HOUR = "max_fetches_per_hour"
+CONF_MAX_FETCHES_PER_DAY = "max_fetches_per_day"
+CONF_BLACKOUT_WINDOWS = "blackout_windows"
+CONF_START = "start"
+CONF_END = "end"
+
+# Вікна без запитів до проксі (Europe/Kyiv, кінець не включно); за замовчуванням —
+# опівнічне 00:00–00:04, коли проксі перемикає добу
+DEFAULT_BLACKOUT_WINDOWS = [{CONF_START: time(0, 0), CONF_END: time(0, 5)}]
+
+# SSE-потік проксі з повними JSON при кожній зміні
+DEFAULT_PUSH_URL = f"{API_URL}/events"
+
+# Подія шини HA при зміні розкладу черги (несе лише дифф слотів)
+EVENT_SCHEDULE_CHANGED = "svitlo_live_schedule_changed"
+
+# Події за N хвилин (event_lead_times) до початку / кінця відключення
+EVENT_OUTAGE_UPCOMING = "svitlo_live_outage_upcoming"
+EVENT_POWER_RETURNING = "svitlo_live_power_returning"
+
+# Внутрішній dispatcher-сигнал (coordinator, payload) — для websocket-підписників
+SIGNAL_SCHEDULE_UPDATED = f"{DOMAIN}_schedule_updated"
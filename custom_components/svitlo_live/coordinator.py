@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+import time as monotonic_time
 from datetime import datetime, timedelta, date, time
 from typing import Any, Optional, Callable
 
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
@@ -15,9 +17,31 @@ from .const import (
     DOMAIN,
     API_URL,
     CONF_REGION,
+    CONF_BLACKOUT_WINDOWS,
+    CONF_END,
+    CONF_EVENT_LEAD_TIMES,
+    CONF_MAX_FETCHES_PER_DAY,
+    CONF_MAX_FETCHES_PER_HOUR,
+    CONF_MIRRORS,
     CONF_QUEUE,
+    CONF_RECORD_DIR,
+    CONF_SHARED_CACHE,
+    CONF_SHARED_CACHE_MAX_AGE,
+    CONF_START,
+    DEFAULT_BLACKOUT_WINDOWS,
     DEFAULT_SCAN_INTERVAL,
+    EVENT_SCHEDULE_CHANGED,
+    OFFLOAD_THRESHOLD_BYTES,
+    SIGNAL_SCHEDULE_UPDATED,
 )
+from .client import SvitloClient
+from .lead_events import LeadEventScheduler
+from .model import ScheduleSnapshot, SharedDocument
+from .request_budget import RequestBudget
+from .schedule import diff_off_slots, slot_time
+from .shared_cache import SharedScheduleCache
+from .snapshots import async_record_snapshot
+from .wire import DaySlots, slot_codes
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,30 +51,154 @@ TZ_KYIV = dt_util.get_time_zone("Europe/Kyiv")
 # Спільний кеш: скільки секунд перевикористовуємо JSON, щоби уникнути дублів на старті
 MIN_REUSE_SECONDS = 120
 
-# Блок оновлень навколо опівночі (за Києвом)
-MIDNIGHT_BLOCK_MINUTES = 5  # 00:00–00:04
+# Навіть при живому push-каналі документ старший за це перезапитуємо: потік може
+# бути відкритим, але мовчати (проксі перестав публікувати)
+PUSH_MAX_REUSE_SECONDS = 4 * DEFAULT_SCAN_INTERVAL
+
+# Ревалідація після опівнічного rollover: одразу по вікну тиші + розкид (сек),
+# щоб інсталяції не приходили на проксі одночасно
+ROLLOVER_REVALIDATE_JITTER = 120
+
+# Код слоту проксі -> стан; решта кодів — unknown
+_SLOT_STATES = {"1": "on", "2": "off"}
+
+
+@callback
+def async_get_coordinators(hass: HomeAssistant) -> dict[str, "SvitloCoordinator"]:
+    """entry_id -> координатор (без службових ключів hass.data[DOMAIN])."""
+    return {
+        key: value
+        for key, value in hass.data.get(DOMAIN, {}).items()
+        if isinstance(value, SvitloCoordinator)
+    }
+
+
+@callback
+def _store_shared_json(
+    hass: HomeAssistant,
+    shared: dict[str, Any],
+    api: dict[str, Any],
+    size: int,
+    fetched_utc: Optional[datetime] = None,
+) -> SharedDocument:
+    """Кладе JSON у кеш процесу; fetched_utc задано — копія з файлу іншого інстансу."""
+    own_fetch = fetched_utc is None
+    doc = SharedDocument(api, fetched_utc or dt_util.utcnow(), size)
+    # Одне присвоєння — читачі без локу бачать цілу копію, стару або нову
+    shared["doc"] = doc
+
+    # Режим запису: кожен отриманий JSON з часом отримання — для replay-симуляцій
+    record_dir = (hass.data.get(DOMAIN, {}).get("_config") or {}).get(CONF_RECORD_DIR)
+    if own_fetch and record_dir:
+        hass.async_create_task(async_record_snapshot(hass, record_dir, doc.fetched_utc, api))
+    return doc
+
+
+async def async_apply_shared_json(hass: HomeAssistant, api: dict[str, Any], size: int) -> None:
+    """Кладе свіжий JSON у спільний кеш і перебудовує всі координатори.
+
+    Payload'и всіх entry будуються одним пакетом — для великого документа в executor.
+    """
+    shared = hass.data.get(DOMAIN, {}).get("_shared_api")
+    if shared is None:
+        return
+    doc = _store_shared_json(hass, shared, api, size)
+    file_cache: Optional[SharedScheduleCache] = shared.get("file_cache")
+    if file_cache is not None:
+        hass.async_create_task(file_cache.async_store(doc))
+    coordinators = list(async_get_coordinators(hass).values())
+    if size >= OFFLOAD_THRESHOLD_BYTES:
+        results = await hass.async_add_executor_job(_build_batch, coordinators, api)
+    else:
+        results = _build_batch(coordinators, api)
+    for coordinator, result in results:
+        coordinator.async_apply_payload(result)
+
+
+def _build_batch(
+    coordinators: list["SvitloCoordinator"], api: dict[str, Any]
+) -> list[tuple["SvitloCoordinator", ScheduleSnapshot | UpdateFailed]]:
+    results: list[tuple[SvitloCoordinator, ScheduleSnapshot | UpdateFailed]] = []
+    for coordinator in coordinators:
+        try:
+            results.append((coordinator, coordinator._build_payload(api)))
+        except UpdateFailed as e:
+            results.append((coordinator, e))
+    return results
+
+
+def _roll_days(
+    date_today: Optional[str], date_tomorrow: Optional[str], local_day: date
+) -> tuple[Optional[str], Optional[str]]:
+    """Дати документа з поправкою на локальну добу.
 
+    Після півночі документ ще вчорашній: його «завтра» стає «сьогодні»,
+    а якщо завтрашнього розкладу нема — сьогодні без розкладу (nosched).
+    """
+    if not date_today or date.fromisoformat(date_today) >= local_day:
+        return date_today, date_tomorrow
+    local_iso = local_day.isoformat()
+    if date_tomorrow == local_iso:
+        return date_tomorrow, None
+    return local_iso, None
 
-class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+
+class SvitloCoordinator(DataUpdateCoordinator[ScheduleSnapshot]):
     """Тягне JSON з проксі 1 раз на весь HA і будує дані для конкретного region/queue."""
 
     def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
         self.hass = hass
         self.region: str = config[CONF_REGION]
         self.queue: str = config[CONF_QUEUE]
+        self.entry_id: Optional[str] = config.get("entry_id")
 
         scan_seconds = int(config.get("scan_interval_seconds", DEFAULT_SCAN_INTERVAL))
 
         shared = hass.data.setdefault(DOMAIN, {})
         if "_shared_api" not in shared:
+            conf = shared.get("_config") or {}
             shared["_shared_api"] = {
-                "lock": asyncio.Lock(),
-                "last_json": None,
-                "last_json_utc": None,
+                "client": SvitloClient(hass, [API_URL, *conf.get(CONF_MIRRORS, [])]),
+                # Остання копія JSON (SharedDocument) і поточний фетч, до якого
+                # приєднуються всі, хто прийшов, поки він триває
+                "doc": None,
+                "inflight": None,
+                "push": None,
+                "budget": RequestBudget(
+                    hass,
+                    conf.get(CONF_MAX_FETCHES_PER_HOUR),
+                    conf.get(CONF_MAX_FETCHES_PER_DAY),
+                    [
+                        (window[CONF_START], window[CONF_END])
+                        for window in conf.get(CONF_BLACKOUT_WINDOWS, DEFAULT_BLACKOUT_WINDOWS)
+                    ],
+                ),
+                "file_cache": (
+                    SharedScheduleCache(
+                        hass,
+                        conf[CONF_SHARED_CACHE],
+                        conf.get(CONF_SHARED_CACHE_MAX_AGE, DEFAULT_SCAN_INTERVAL),
+                    )
+                    if conf.get(CONF_SHARED_CACHE)
+                    else None
+                ),
             }
         self._shared_api = shared["_shared_api"]
 
+        lead_times = (shared.get("_config") or {}).get(CONF_EVENT_LEAD_TIMES)
+        self._lead_events: Optional[LeadEventScheduler] = (
+            LeadEventScheduler(hass, self, lead_times) if lead_times else None
+        )
+
         self._unsub_precise: Optional[Callable[[], None]] = None
+        self._unsub_rollover: Optional[Callable[[], None]] = None
+        self._unsub_revalidate: Optional[Callable[[], None]] = None
+        self._last_days: Optional[dict[str, list[str]]] = None
+        self._last_hash: Optional[str] = None
+
+        # Скільки мс цикл оновлення тримав event loop (останній / максимум)
+        self.loop_block_ms: float = 0.0
+        self.loop_block_max_ms: float = 0.0
 
         super().__init__(
             hass=hass,
@@ -59,130 +207,289 @@ class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(seconds=scan_seconds),
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        # 1) Спільний кеш
-        now_utc = dt_util.utcnow()
+    async def _async_update_data(self) -> ScheduleSnapshot:
+        # 1) Спільний кеш: свіжа копія читається без локу й без await
         shared = self._shared_api
-        last_json = shared.get("last_json")
-        last_json_utc: Optional[datetime] = shared.get("last_json_utc")
-
-        should_reuse = (
-            last_json is not None
-            and last_json_utc is not None
-            and (now_utc - last_json_utc).total_seconds() < MIN_REUSE_SECONDS
+        doc: Optional[SharedDocument] = shared["doc"]
+        push = shared.get("push")
+        age = doc.age(dt_util.utcnow()) if doc is not None else None
+        should_reuse = age is not None and (
+            age < MIN_REUSE_SECONDS
+            # Push-канал живий — кеш оновлюється ним самим, опитування не потрібне
+            or (push is not None and push.connected and age < PUSH_MAX_REUSE_SECONDS)
         )
-
         if not should_reuse:
-            async with shared["lock"]:
-                last_json = shared.get("last_json")
-                last_json_utc = shared.get("last_json_utc")
-                should_reuse = (
-                    last_json is not None
-                    and last_json_utc is not None
-                    and (dt_util.utcnow() - last_json_utc).total_seconds() < MIN_REUSE_SECONDS
+            doc = await self._async_join_refresh()
+
+        # 2) Побудова payload — великий документ обробляємо в executor
+        started = monotonic_time.perf_counter()
+        if doc.size >= OFFLOAD_THRESHOLD_BYTES:
+            payload = await self.hass.async_add_executor_job(self._build_payload, doc.document)
+            started = monotonic_time.perf_counter()
+        else:
+            payload = self._build_payload(doc.document)
+        self._finalize(payload)
+        self._record_loop_block(started)
+        return payload
+
+    async def _async_join_refresh(self) -> SharedDocument:
+        """Single-flight: один фетч на процес, решта координаторів чекає на нього ж.
+
+        shield — скасування одного з тих, хто чекає, не обриває спільний фетч.
+        """
+        shared = self._shared_api
+        task: Optional[asyncio.Task[SharedDocument]] = shared["inflight"]
+        if task is None:
+            task = self.hass.async_create_task(self._async_refresh_shared_json(shared["doc"]))
+            shared["inflight"] = task
+
+            @callback
+            def _done(finished: asyncio.Task) -> None:
+                if shared["inflight"] is finished:
+                    shared["inflight"] = None
+
+            task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    async def _async_refresh_shared_json(self, doc: Optional[SharedDocument]) -> SharedDocument:
+        """Оновлює кеш процесу: свіжий файл-кеш хоста, інакше запит до API.
+
+        Виконується лише в одному task'у `shared["inflight"]`.
+        """
+        shared = self._shared_api
+        file_cache: Optional[SharedScheduleCache] = shared.get("file_cache")
+
+        # Інший інстанс на хості вже оновив файл — в API не йдемо
+        if file_cache is not None:
+            copy = await file_cache.async_load()
+            if copy is not None:
+                _LOGGER.debug("Reused schedule JSON from shared cache %s", file_cache.path)
+                return _store_shared_json(
+                    self.hass, shared, copy.document, copy.size, copy.fetched_utc
+                )
+
+        # -------- Бюджет запитів: вікна тиші та ліміти на годину / добу --------
+        budget: RequestBudget = shared["budget"]
+        priority = doc is None or self._tomorrow_missing()
+        refused = await budget.async_check(dt_util.utcnow(), priority)
+        if refused is not None:
+            if doc is None:
+                # Кешу нема, а запит заборонено — в API не ліземо
+                raise UpdateFailed(f"Request budget: {refused}, no cached data available yet")
+            _LOGGER.debug(
+                "Request budget: %s; reusing cached JSON from %s without new API call",
+                refused,
+                doc.fetched_utc,
+            )
+            return doc
+
+        # -------- Звичайний фетч --------
+        if file_cache is None:
+            return await self._async_fetch_to_shared()
+
+        async with file_cache.async_refresh_lock() as copy:
+            if copy is not None:
+                # Поки чекали на лок, файл оновив інший інстанс
+                return _store_shared_json(
+                    self.hass, shared, copy.document, copy.size, copy.fetched_utc
                 )
+            fetched = await self._async_fetch_to_shared()
+            # Пишемо ще під локом — інстанси, що чекають, одразу побачать свіжий файл
+            await file_cache.async_store(fetched)
+            return fetched
+
+    def _tomorrow_missing(self) -> bool:
+        """Хоч одна черга без завтрашнього розкладу — фетч пріоритетний."""
+        return any(
+            c.data is None or c.data.tomorrow_date is None
+            for c in (self, *async_get_coordinators(self.hass).values())
+        )
+
+    async def _async_fetch_to_shared(self) -> SharedDocument:
+        shared = self._shared_api
+        shared["budget"].record(dt_util.utcnow())
+        try:
+            api = await self._async_fetch_json()
+        except Exception as e:
+            raise UpdateFailed(f"Network error: {e}") from e
+        _LOGGER.debug("Fetched API once for all entries (%s)", API_URL)
+        return _store_shared_json(self.hass, shared, api, shared["client"].document_size)
+
+    async def _async_fetch_json(self) -> dict[str, Any]:
+        """Один (хеджований між дзеркалами) запит до проксі; кеш — на боці викликача."""
+        return await self._shared_api["client"].async_fetch_json()
 
-                if not should_reuse:
-                    # -------- MIDNIGHT GUARD: 00:00–00:04 Europe/Kyiv --------
-                    now_kyiv = dt_util.now(TZ_KYIV)
-                    if now_kyiv.hour == 0 and now_kyiv.minute < MIDNIGHT_BLOCK_MINUTES:
-                        if last_json is None:
-                            # Старт рівно опівночі без кешу – взагалі не ліземо в API
-                            raise UpdateFailed(
-                                "Midnight guard active (00:00–00:04 Europe/Kyiv) "
-                                "and no cached data available yet"
-                            )
-
-                        _LOGGER.debug(
-                            "Midnight guard: 00:00–00:%02d Europe/Kyiv, "
-                            "reusing cached JSON from %s without new API call",
-                            MIDNIGHT_BLOCK_MINUTES - 1,
-                            last_json_utc,
-                        )
-                        # Просто використовуємо last_json, не роблячи новий запит
-                    else:
-                        # -------- Звичайний фетч --------
-                        try:
-                            session = async_get_clientsession(self.hass)
-                            async with session.get(API_URL, timeout=30) as resp:
-                                if resp.status != 200:
-                                    raise UpdateFailed(f"HTTP {resp.status} for {API_URL}")
-                                last_json = await resp.json(content_type=None)
-                                shared["last_json"] = last_json
-                                shared["last_json_utc"] = dt_util.utcnow()
-                                _LOGGER.debug("Fetched API once for all entries (%s)", API_URL)
-                        except Exception as e:
-                            raise UpdateFailed(f"Network error: {e}") from e
-
-        # 2) Побудова payload
+    def _build_payload(self, api: dict[str, Any]) -> ScheduleSnapshot:
+        """Чиста побудова payload (без доступу до HA) — безпечно для executor."""
         try:
-            payload = self._build_from_api(last_json)
+            return self._build_from_api(api)
         except Exception as e:
             raise UpdateFailed(f"Parse/build error: {e}") from e
 
-        # 3) Точний тик
+    def _finalize(self, payload: ScheduleSnapshot) -> None:
+        # 3) Відбиток розкладу + подія про зміни
+        self._track_schedule_change(payload)
+
+        # 4) Точний тик
         self._schedule_precise_refresh(payload)
-        return payload
+
+        # 5) Перехід на нову добу опівночі
+        self._schedule_rollover()
+
+    def _record_loop_block(self, started: float) -> None:
+        self.loop_block_ms = (monotonic_time.perf_counter() - started) * 1000
+        self.loop_block_max_ms = max(self.loop_block_max_ms, self.loop_block_ms)
+        _LOGGER.debug(
+            "Update cycle for %s/%s blocked the event loop for %.2f ms (max %.2f ms)",
+            self.region, self.queue, self.loop_block_ms, self.loop_block_max_ms,
+        )
+
+    @callback
+    def async_apply_payload(self, payload: ScheduleSnapshot | UpdateFailed) -> None:
+        """Застосовує payload, зібраний поза опитуванням (push), без мережевого запиту."""
+        if isinstance(payload, UpdateFailed):
+            _LOGGER.warning(
+                "Update for %s/%s built without a fetch not applied: %s",
+                self.region, self.queue, payload,
+            )
+            return
+        started = monotonic_time.perf_counter()
+        self._finalize(payload)
+        self.async_set_updated_data(payload)
+        self._record_loop_block(started)
+
+    async def async_rebind(self, region: str, queue: str) -> None:
+        """Перемикає координатор на іншу чергу без перезавантаження entry.
+
+        Payload будується зі спільного кешу JSON; запит до API — лише якщо кешу ще нема.
+        """
+        self.region, self.queue = region, queue
+        self.name = f"svitlo_live_{region}_{queue}"
+        # Нова черга — не дифф до старої: наступний розклад піде як початковий
+        self._last_hash = None
+        self._last_days = None
+
+        doc: Optional[SharedDocument] = self._shared_api["doc"]
+        if doc is None:
+            await self.async_request_refresh()
+            return
+        if doc.size >= OFFLOAD_THRESHOLD_BYTES:
+            payload = await self.hass.async_add_executor_job(self._build_payload_safe, doc.document)
+        else:
+            payload = self._build_payload_safe(doc.document)
+        if isinstance(payload, UpdateFailed):
+            self.async_set_update_error(payload)
+            return
+        self.async_apply_payload(payload)
+
+    async def async_shutdown(self) -> None:
+        for attr in ("_unsub_precise", "_unsub_rollover", "_unsub_revalidate"):
+            unsub = getattr(self, attr)
+            if unsub:
+                unsub()
+                setattr(self, attr, None)
+        if self._lead_events is not None:
+            self._lead_events.cancel()
+        await super().async_shutdown()
+
+    # ---------------------------------------------------------------------
+    # Опівнічний rollover
+    # ---------------------------------------------------------------------
+
+    def _schedule_rollover(self) -> None:
+        if self._unsub_rollover:
+            self._unsub_rollover()
+        next_midnight = slot_time(dt_util.now(TZ_KYIV).date() + timedelta(days=1), 0)
+        self._unsub_rollover = async_track_point_in_utc_time(
+            self.hass, self._async_rollover, next_midnight
+        )
+
+    async def _async_rollover(self, now_utc: datetime) -> None:
+        """Північ за Києвом: завтрашній розклад з кешу стає сьогоднішнім, без запиту.
+
+        Свіжий документ тягнемо лише після опівнічного вікна тиші (якщо воно є).
+        """
+        self._unsub_rollover = None
+        doc: Optional[SharedDocument] = self._shared_api["doc"]
+        if doc is None:
+            self._schedule_rollover()
+            return
+
+        if doc.size >= OFFLOAD_THRESHOLD_BYTES:
+            payload = await self.hass.async_add_executor_job(self._build_payload_safe, doc.document)
+        else:
+            payload = self._build_payload_safe(doc.document)
+        _LOGGER.debug("Midnight rollover for %s/%s applied from cache", self.region, self.queue)
+        self.async_apply_payload(payload)
+        if isinstance(payload, UpdateFailed):
+            self._schedule_rollover()
+
+        if self._unsub_revalidate:
+            self._unsub_revalidate()
+        budget: RequestBudget = self._shared_api["budget"]
+        revalidate_at = (budget.blackout_end(now_utc) or now_utc) + timedelta(
+            seconds=random.uniform(0, ROLLOVER_REVALIDATE_JITTER)
+        )
+
+        @callback
+        def _revalidate(_now) -> None:
+            self._unsub_revalidate = None
+            self.hass.async_create_task(self.async_request_refresh())
+
+        self._unsub_revalidate = async_track_point_in_utc_time(self.hass, _revalidate, revalidate_at)
+
+    def _build_payload_safe(self, api: dict[str, Any]) -> ScheduleSnapshot | UpdateFailed:
+        try:
+            return self._build_payload(api)
+        except UpdateFailed as e:
+            return e
 
     # ---------------------------------------------------------------------
     # API -> payload
     # ---------------------------------------------------------------------
 
-    def _build_from_api(self, api: dict[str, Any]) -> dict[str, Any]:
-        date_today = api.get("date_today")
-        date_tomorrow = api.get("date_tomorrow")
+    def _build_from_api(self, api: dict[str, Any]) -> ScheduleSnapshot:
+        now_local = dt_util.now(TZ_KYIV)
+        date_today, date_tomorrow = _roll_days(
+            api.get("date_today"), api.get("date_tomorrow"), now_local.date()
+        )
 
         region_obj = next((r for r in api.get("regions", []) if r.get("cpu") == self.region), None)
         if not region_obj:
             raise ValueError(f"Region {self.region} not found in API")
 
         schedule = (region_obj.get("schedule") or {}).get(self.queue) or {}
-        slots_today_map: dict[str, int] = schedule.get(date_today) or {}
-        slots_tomorrow_map: dict[str, int] = schedule.get(date_tomorrow) or {}
+        slots_today_map: DaySlots = schedule.get(date_today) or {}
+        slots_tomorrow_map: DaySlots = schedule.get(date_tomorrow) or {}
+        today_codes = slot_codes(slots_today_map)
 
         # >>> ЛОГІКА nosched (нема розкладу на сьогодні)
-        has_any_slots = any(v in (1, 2) for v in slots_today_map.values())
+        has_any_slots = "1" in today_codes or "2" in today_codes
         if not has_any_slots:
             base_day = (
                 datetime.fromisoformat(date_today).date()
                 if date_today else dt_util.now(TZ_KYIV).date()
             )
-            data_nosched: dict[str, Any] = {
-                "queue": self.queue,
-                "date": base_day.isoformat(),
-                "now_status": "nosched",
-                "now_halfhour_index": None,
-                "next_change_at": None,
-                "today_48half": [],
-                "updated": dt_util.utcnow().replace(microsecond=0).isoformat(),
-                "source": API_URL,
-                "next_on_at": None,
-                "next_off_at": None,
-            }
-            if date_tomorrow and (schedule.get(date_tomorrow) or {}):
-                data_nosched["tomorrow_date"] = date_tomorrow
-                data_nosched["tomorrow_48half"] = []
-            return data_nosched
+            return ScheduleSnapshot(
+                queue=self.queue,
+                date=base_day.isoformat(),
+                now_status="nosched",
+                updated=dt_util.utcnow().replace(microsecond=0),
+                source=API_URL,
+                tomorrow_date=(
+                    date_tomorrow if date_tomorrow and (schedule.get(date_tomorrow) or {}) else None
+                ),
+            )
         # <<< КІНЕЦЬ nosched
 
-        def build_half_list(slots_map: dict[str, int]) -> list[str]:
-            res: list[str] = []
-            for h in range(24):
-                for m in (0, 30):
-                    label = f"{h:02d}:{m:02d}"
-                    code = int(slots_map.get(label, 0))
-                    if code == 1:
-                        res.append("on")
-                    elif code == 2:
-                        res.append("off")
-                    else:
-                        res.append("unknown")
-            return res
-
-        today_half = build_half_list(slots_today_map)
-        tomorrow_half = build_half_list(slots_tomorrow_map) if slots_tomorrow_map else []
+        def build_half_list(codes: str) -> tuple[str, ...]:
+            return tuple(_SLOT_STATES.get(c, "unknown") for c in codes)
+
+        today_half = build_half_list(today_codes)
+        tomorrow_half = (
+            build_half_list(slot_codes(slots_tomorrow_map)) if slots_tomorrow_map else ()
+        )
 
-        now_local = dt_util.now(TZ_KYIV)
         base_day = datetime.fromisoformat(date_today).date() if date_today else now_local.date()
         if now_local.date() != base_day:
             idx = 0
@@ -201,28 +508,75 @@ class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         next_on_at = self._find_next_at(["on"], base_day, today_half, idx, date_tomorrow, tomorrow_half)
         next_off_at = self._find_next_at(["off"], base_day, today_half, idx, date_tomorrow, tomorrow_half)
 
-        data: dict[str, Any] = {
+        has_tomorrow = bool(date_tomorrow and tomorrow_half)
+        return ScheduleSnapshot(
+            queue=self.queue,
+            date=base_day.isoformat(),
+            now_status=cur,
+            updated=dt_util.utcnow().replace(microsecond=0),
+            source=API_URL,
+            now_halfhour_index=idx,
+            next_change_at=next_change_hhmm,
+            next_on_at=next_on_at,
+            next_off_at=next_off_at,
+            today_48half=today_half,
+            tomorrow_date=date_tomorrow if has_tomorrow else None,
+            tomorrow_48half=tomorrow_half if has_tomorrow else (),
+        )
+
+    # ---------------------------------------------------------------------
+    # Відбиток розкладу та подія зміни
+    # ---------------------------------------------------------------------
+
+    def _track_schedule_change(self, data: ScheduleSnapshot) -> None:
+        days = data.days
+        new_hash = data.schedule_hash
+
+        old_hash, old_days = self._last_hash, self._last_days
+        self._last_hash, self._last_days = new_hash, days
+
+        if old_hash == new_hash:
+            return
+        async_dispatcher_send(self.hass, SIGNAL_SCHEDULE_UPDATED, self, data)
+        if self._lead_events is not None:
+            self._lead_events.async_schedule(data)
+
+        # Перший розрахунок (старт HA) — нема з чим порівнювати
+        if old_hash is None:
+            return
+
+        event_data: dict[str, Any] = {
+            "entry_id": self.entry_id,
+            "region": self.region,
             "queue": self.queue,
-            "date": base_day.isoformat(),
-            "now_status": cur,
-            "now_halfhour_index": idx,
-            "next_change_at": next_change_hhmm,
-            "today_48half": today_half,
-            "updated": dt_util.utcnow().replace(microsecond=0).isoformat(),
-            "source": API_URL,
-            "next_on_at": next_on_at,
-            "next_off_at": next_off_at,
+            "schedule_hash": new_hash,
+            "previous_hash": old_hash,
         }
-
-        if date_tomorrow and tomorrow_half:
-            data.update(
-                {
-                    "tomorrow_date": date_tomorrow,
-                    "tomorrow_48half": tomorrow_half,
-                }
+        old_days = old_days or {}
+        for key, day in (("today", data.date), ("tomorrow", data.tomorrow_date)):
+            if not day:
+                continue
+            added, removed = diff_off_slots(old_days.get(day), days[day])
+            event_data[key] = {"date": day, "added": added, "removed": removed}
+        # Завтрашній розклад відкликали (а не просто настала нова доба)
+        withdrawn = sorted(d for d in old_days if d > data.date and d not in days)
+        if not data.tomorrow_date and withdrawn:
+            added, removed = diff_off_slots(old_days[withdrawn[0]], ())
+            event_data["tomorrow"] = {"date": withdrawn[0], "added": added, "removed": removed}
+
+        # Зсув доби опівночі міняє хеш, але не слоти — подія без змін нікому не потрібна
+        if not any(
+            diff["added"] or diff["removed"]
+            for diff in (event_data.get("today"), event_data.get("tomorrow"))
+            if diff
+        ):
+            _LOGGER.debug(
+                "Schedule hash changed for %s/%s without slot changes", self.region, self.queue
             )
+            return
 
-        return data
+        _LOGGER.debug("Schedule changed for %s/%s: %s", self.region, self.queue, event_data)
+        self.hass.bus.async_fire(EVENT_SCHEDULE_CHANGED, event_data)
 
     # ---------------------------------------------------------------------
     # Планувальник точного оновлення
@@ -237,8 +591,8 @@ class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             return localize(d)
         return d.replace(tzinfo=TZ_KYIV)
 
-    def _schedule_precise_refresh(self, data: dict[str, Any]) -> None:
-        if data.get("now_status") == "nosched":
+    def _schedule_precise_refresh(self, data: ScheduleSnapshot) -> None:
+        if data.now_status == "nosched":
             if self._unsub_precise:
                 self._unsub_precise()
                 self._unsub_precise = None
@@ -249,8 +603,8 @@ class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             self._unsub_precise()
             self._unsub_precise = None
 
-        next_change_hhmm = data.get("next_change_at")
-        base_date_iso = data.get("date")
+        next_change_hhmm = data.next_change_at
+        base_date_iso = data.date
         if not next_change_hhmm or not base_date_iso:
             return
 
@@ -286,7 +640,7 @@ class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     # ---------------------------------------------------------------------
 
     @staticmethod
-    def _next_change_idx(series: list[str], idx: int) -> Optional[int]:
+    def _next_change_idx(series: tuple[str, ...], idx: int) -> Optional[int]:
         if not series:
             return None
         cur = series[idx]
@@ -301,11 +655,11 @@ class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def _find_next_at(
         target_states: list[str],
         base_date: date,
-        today_half: list[str],
+        today_half: tuple[str, ...],
         idx: int,
         tomorrow_date_iso: Optional[str],
-        tomorrow_half: Optional[list[str]],
-    ) -> Optional[str]:
+        tomorrow_half: tuple[str, ...],
+    ) -> Optional[datetime]:
         if not today_half:
             return None
 
@@ -332,4 +686,4 @@ class SvitloCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             minutes_into_tomorrow = (pos - len(today_tail)) * 30
             next_local = base_local_midnight + timedelta(minutes=minutes_into_tomorrow)
 
-        return dt_util.as_utc(next_local).isoformat()
+        return dt_util.as_utc(next_local)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .client import SvitloClient
+from .const import DOMAIN
+from .model import SharedDocument
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Стан черги та спільного фетчера: дзеркала з латентністю й фазами запитів, кеш, push."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    shared = hass.data[DOMAIN].get("_shared_api") or {}
+    client: Optional[SvitloClient] = shared.get("client")
+    doc: Optional[SharedDocument] = shared.get("doc")
+    push = shared.get("push")
+    budget = shared.get("budget")
+    snap = coordinator.data if coordinator is not None else None
+
+    return {
+        "coordinator": None if coordinator is None else {
+            "region": coordinator.region,
+            "queue": coordinator.queue,
+            "last_update_success": coordinator.last_update_success,
+            "schedule_hash": snap.schedule_hash if snap else None,
+            "loop_block_ms": round(coordinator.loop_block_ms, 2),
+            "loop_block_max_ms": round(coordinator.loop_block_max_ms, 2),
+        },
+        "document": None if doc is None else {
+            "age_seconds": round(doc.age(dt_util.utcnow()), 1),
+            "size": doc.size,
+            "date_today": doc.document.get("date_today"),
+            "date_tomorrow": doc.document.get("date_tomorrow"),
+        },
+        "mirrors": None if client is None else {
+            # Медіана латентності (сек) і фази останнього успішного запиту
+            "latency": client.latency_stats(),
+            "last_request": client.timing_stats(),
+            "last_body_size": client.last_body_size,
+        },
+        "push": None if push is None else {"url": push.url, "connected": push.connected},
+        "budget": None if budget is None else {
+            "max_per_hour": budget.max_per_hour,
+            "max_per_day": budget.max_per_day,
+            "blackouts": [f"{start:%H:%M}-{end:%H:%M}" for start, end in budget.blackouts],
+        },
+    }
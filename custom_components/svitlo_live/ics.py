@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from http import HTTPStatus
+from typing import Optional
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SIGNAL_SCHEDULE_UPDATED
+from .coordinator import SvitloCoordinator, async_get_coordinators
+from .labels import device_label, event_texts
+from .schedule import off_periods
+
+ICS_URL = "/api/svitlo_live/ics"
+ICS_CONTENT_TYPE = "text/calendar"
+
+_PRODID = "-//svitlo.live//Svitlo Live//UK"
+
+
+@callback
+def async_register_ics_view(hass: HomeAssistant) -> None:
+    cache = IcsFeedCache(hass)
+
+    @callback
+    def _on_schedule_updated(coordinator: SvitloCoordinator, _data) -> None:
+        if coordinator.entry_id is not None:
+            cache.invalidate(coordinator.entry_id)
+
+    async_dispatcher_connect(hass, SIGNAL_SCHEDULE_UPDATED, _on_schedule_updated)
+    hass.http.register_view(SvitloIcsView(cache))
+
+
+class _Rendered:
+    __slots__ = ("key", "vevents")
+
+    def __init__(self, key: tuple[str, str], vevents: list[str]) -> None:
+        self.key = key
+        self.vevents = vevents
+
+
+class IcsFeedCache:
+    """VEVENT-и кожної черги, зрендерені раз на зміну розкладу (або назви пристрою).
+
+    Готові фіди (тіло + ETag) кешуються за набором entry; будь-яка зміна черги
+    скидає всі фіди, де вона є.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._entries: dict[str, _Rendered] = {}
+        self._feeds: dict[tuple[str, ...], tuple[bytes, str]] = {}
+
+    @callback
+    def invalidate(self, entry_id: str) -> None:
+        self._entries.pop(entry_id, None)
+        self._feeds = {ids: feed for ids, feed in self._feeds.items() if entry_id not in ids}
+
+    @callback
+    def feed(self, coordinators: dict[str, SvitloCoordinator]) -> tuple[bytes, str]:
+        """(тіло ICS, ETag) для набору entry."""
+        ids = tuple(sorted(coordinators))
+        vevents: list[str] = []
+        for entry_id in ids:
+            vevents.extend(self._entry_vevents(entry_id, coordinators[entry_id]))
+
+        feed = self._feeds.get(ids)
+        if feed is None:
+            body = _calendar(vevents).encode("utf-8")
+            feed = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+            self._feeds[ids] = feed
+        return feed
+
+    def _entry_vevents(self, entry_id: str, coordinator: SvitloCoordinator) -> list[str]:
+        snap = coordinator.data
+        label = device_label(self.hass, coordinator.region, coordinator.queue)
+        key = (snap.schedule_hash if snap else "", label)
+
+        rendered = self._entries.get(entry_id)
+        if rendered is not None and rendered.key == key:
+            return rendered.vevents
+
+        vevents: list[str] = []
+        if snap is not None:
+            stamp = dt_util.utcnow()
+            for day, halfhours in snap.days.items():
+                for start, end in off_periods(day, halfhours):
+                    summary, description = event_texts(label, start, end)
+                    vevents.append(
+                        _vevent(f"{entry_id}-{_ics_time(start)}@{DOMAIN}", stamp, start, end, summary, description)
+                    )
+        self._entries[entry_id] = _Rendered(key, vevents)
+        # Черга перерендерилась (напр., перейменовано пристрій) — її фіди застаріли
+        self._feeds = {ids: feed for ids, feed in self._feeds.items() if entry_id not in ids}
+        return vevents
+
+
+class SvitloIcsView(HomeAssistantView):
+    """ICS-фід відключень: усі черги або одна (`/api/svitlo_live/ics/<entry_id>`).
+
+    Потребує авторизації (Bearer-токен або підписаний шлях). Підтримує ETag / 304.
+    """
+
+    url = ICS_URL
+    extra_urls = [ICS_URL + "/{entry_id}"]
+    name = "api:svitlo_live:ics"
+
+    def __init__(self, cache: IcsFeedCache) -> None:
+        self._cache = cache
+
+    async def get(self, request: web.Request, entry_id: Optional[str] = None) -> web.Response:
+        hass: HomeAssistant = request.app["hass"]
+        coordinators = async_get_coordinators(hass)
+        if entry_id is not None:
+            if entry_id not in coordinators:
+                return web.Response(status=HTTPStatus.NOT_FOUND)
+            coordinators = {entry_id: coordinators[entry_id]}
+
+        body, etag = self._cache.feed(coordinators)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in _if_none_match(request):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(
+            body=body, content_type=ICS_CONTENT_TYPE, charset="utf-8", headers=headers
+        )
+
+
+def _if_none_match(request: web.Request) -> set[str]:
+    raw = request.headers.get("If-None-Match", "")
+    return {tag.strip().removeprefix("W/") for tag in raw.split(",") if tag.strip()}
+
+
+# ---------------------------------------------------------------------------
+# RFC 5545
+# ---------------------------------------------------------------------------
+
+def _calendar(vevents: list[str]) -> str:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{_PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:Svitlo Live",
+    ]
+    return "\r\n".join(lines) + "\r\n" + "".join(vevents) + "END:VCALENDAR\r\n"
+
+
+def _vevent(
+    uid: str, stamp: datetime, start: datetime, end: datetime, summary: str, description: str
+) -> str:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{_ics_time(stamp)}",
+        f"DTSTART:{_ics_time(start)}",
+        f"DTEND:{_ics_time(end)}",
+        f"SUMMARY:{_escape(summary)}",
+        f"DESCRIPTION:{_escape(description)}",
+        "TRANSP:OPAQUE",
+        "END:VEVENT",
+    ]
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def _ics_time(value: datetime) -> str:
+    return dt_util.as_utc(value).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Розриває рядок на шматки ≤75 октетів (UTF-8), не ріжучи символи."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line
+    parts: list[str] = []
+    chunk = ""
+    size = 0
+    limit = 75
+    for ch in line:
+        width = len(ch.encode("utf-8"))
+        if size + width > limit:
+            parts.append(chunk)
+            chunk, size, limit = "", 0, 74  # продовження починається з пробілу
+        chunk += ch
+        size += width
+    parts.append(chunk)
+    return "\r\n ".join(parts)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+from .schedule import TZ_KYIV
+
+# Тексти подій і назва пристрою — спільні для календаря та ICS. Окремо від
+# calendar.py, щоб ICS не тягнув платформу календаря (і компонент calendar HA)
+
+
+def device_label(hass: HomeAssistant, region: str, queue: str) -> str:
+    """Повертає ім'я пристрою з реєстру (name_by_user -> name) або дефолт."""
+    try:
+        dev_reg = dr.async_get(hass)
+        device = dev_reg.async_get_device(identifiers={(DOMAIN, f"{region}_{queue}")})
+        if device:
+            # name_by_user має пріоритет, якщо користувач перейменував
+            if device.name_by_user:
+                return device.name_by_user
+            if device.name:
+                return device.name
+    except Exception:
+        # не драматизуємо, просто впадемо на дефолт
+        pass
+    return f"{region} / {queue}"
+
+
+def event_texts(label: str, start_utc: datetime, end_utc: datetime) -> tuple[str, str]:
+    """(summary, description) події відключення — спільні для календаря та ICS."""
+    start_local = start_utc.astimezone(TZ_KYIV)
+    end_local = end_utc.astimezone(TZ_KYIV)
+    prefix = f"[{label}]"
+    return (
+        f"{prefix} ❌ Відключення електроенергії",
+        f"{prefix} Немає світла {start_local.strftime('%H:%M')}–{end_local.strftime('%H:%M')}",
+    )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import EVENT_OUTAGE_UPCOMING, EVENT_POWER_RETURNING
+from .model import ScheduleSnapshot
+
+if TYPE_CHECKING:
+    from .coordinator import SvitloCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LeadEventScheduler:
+    """Події за `lead_minutes` до кожного переходу розкладу однієї черги.
+
+    План будується з кешованого знімка лише при зміні розкладу; таймер один —
+    на найближчу подію. Часи, що вже минули на момент побудови плану, пропускаються.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: SvitloCoordinator, lead_minutes: Sequence[int]
+    ) -> None:
+        self.hass = hass
+        self._coordinator = coordinator
+        self._leads = sorted(set(lead_minutes), reverse=True)
+        self._plan: deque[tuple[datetime, int, str, dict[str, Any]]] = deque()
+        self._unsub: Optional[Callable[[], None]] = None
+
+    @callback
+    def async_schedule(self, snapshot: ScheduleSnapshot) -> None:
+        self.cancel()
+        now = dt_util.utcnow()
+        transitions = snapshot.transitions
+        plan: list[tuple[datetime, int, str, dict[str, Any]]] = []
+
+        for i, (at, state) in enumerate(transitions):
+            if at <= now:
+                continue
+            if state == "off":
+                following = transitions[i + 1] if i + 1 < len(transitions) else None
+                ends_at = following[0] if following and following[1] == "on" else None
+                event_type = EVENT_OUTAGE_UPCOMING
+                data = {"starts_at": at.isoformat(), "ends_at": ends_at and ends_at.isoformat()}
+            else:
+                event_type = EVENT_POWER_RETURNING
+                data = {"returns_at": at.isoformat()}
+            for lead in self._leads:
+                fire_at = at - timedelta(minutes=lead)
+                if fire_at > now:
+                    plan.append((fire_at, lead, event_type, data))
+
+        plan.sort(key=lambda item: item[0])
+        self._plan = deque(plan)
+        _LOGGER.debug(
+            "Planned %d lead event(s) for %s/%s",
+            len(plan), self._coordinator.region, self._coordinator.queue,
+        )
+        self._schedule_next()
+
+    @callback
+    def cancel(self) -> None:
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._plan.clear()
+
+    def _schedule_next(self) -> None:
+        if self._plan:
+            self._unsub = async_track_point_in_utc_time(
+                self.hass, self._async_fire_due, self._plan[0][0]
+            )
+
+    @callback
+    def _async_fire_due(self, now_utc: datetime) -> None:
+        self._unsub = None
+        coordinator = self._coordinator
+        while self._plan and self._plan[0][0] <= now_utc:
+            _, lead, event_type, data = self._plan.popleft()
+            self.hass.bus.async_fire(
+                event_type,
+                {
+                    "entry_id": coordinator.entry_id,
+                    "region": coordinator.region,
+                    "queue": coordinator.queue,
+                    "lead_minutes": lead,
+                    **data,
+                },
+            )
+        self._schedule_next()
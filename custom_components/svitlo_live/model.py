@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, NamedTuple, Optional
+
+from .schedule import (
+    SLOT_MINUTES,
+    SLOTS_PER_DAY,
+    Window,
+    compact_slots,
+    local_minute,
+    minutes_in_state,
+    on_windows,
+    prefix_counts,
+    schedule_fingerprint,
+    state_transitions,
+)
+
+
+class SharedDocument(NamedTuple):
+    """Незмінна копія JSON проксі, спільна для всіх координаторів процесу.
+
+    Замінюється цілком одним присвоєнням — читачі бачать або стару, або нову копію.
+    """
+
+    document: dict[str, Any]
+    fetched_utc: datetime
+    size: int
+
+    def age(self, now_utc: datetime) -> float:
+        return (now_utc - self.fetched_utc).total_seconds()
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleSnapshot:
+    """Незмінний знімок розкладу черги — `coordinator.data`, спільний для всіх ентіті.
+
+    Час уже розібраний у datetime; похідні поля рахуються при першому зверненні
+    й кешуються в самому знімку (новий розклад = новий знімок).
+    """
+
+    queue: str
+    date: str
+    now_status: str  # on / off / unknown / nosched
+    updated: datetime
+    source: str
+    now_halfhour_index: Optional[int] = None
+    next_change_at: Optional[str] = None  # HH:MM за Києвом
+    next_on_at: Optional[datetime] = None
+    next_off_at: Optional[datetime] = None
+    today_48half: tuple[str, ...] = ()
+    tomorrow_date: Optional[str] = None
+    tomorrow_48half: tuple[str, ...] = ()
+
+    _hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _days: Optional[dict[str, tuple[str, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _compact: Optional[dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+    _on_windows: Optional[tuple[Window, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _transitions: Optional[tuple[tuple[datetime, str], ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _prefix: Optional[dict[date, tuple[tuple[str, ...], dict[str, tuple[int, ...]]]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def schedule_hash(self) -> str:
+        """Відбиток слотів (не залежить від часу фетчу)."""
+        if self._hash is None:
+            object.__setattr__(
+                self,
+                "_hash",
+                schedule_fingerprint(
+                    self.date, self.today_48half, self.tomorrow_date, self.tomorrow_48half
+                ),
+            )
+        return self._hash
+
+    @property
+    def days(self) -> dict[str, tuple[str, ...]]:
+        """{iso_date: 48 станів} для сьогодні/завтра."""
+        if self._days is None:
+            days = {self.date: self.today_48half}
+            if self.tomorrow_date:
+                days[self.tomorrow_date] = self.tomorrow_48half
+            object.__setattr__(self, "_days", days)
+        return self._days
+
+    @property
+    def compact_days(self) -> dict[str, str]:
+        """{iso_date: '10??…'} — 48 символів на добу, '' якщо графіка нема."""
+        if self._compact is None:
+            object.__setattr__(
+                self, "_compact", {day: compact_slots(half) for day, half in self.days.items()}
+            )
+        return self._compact
+
+    @property
+    def on_windows(self) -> tuple[Window, ...]:
+        """Відсортований індекс 'on'-вікон (UTC) сьогодні+завтра."""
+        if self._on_windows is None:
+            object.__setattr__(self, "_on_windows", tuple(on_windows(self.days)))
+        return self._on_windows
+
+    @property
+    def transitions(self) -> tuple[tuple[datetime, str], ...]:
+        """Переходи on→off / off→on (UTC) сьогодні+завтра, за часом."""
+        if self._transitions is None:
+            object.__setattr__(self, "_transitions", tuple(state_transitions(self.days)))
+        return self._transitions
+
+    @property
+    def slot_prefix(self) -> dict[date, tuple[tuple[str, ...], dict[str, tuple[int, ...]]]]:
+        """{доба: (48 станів, {стан: префіксні суми})} — лише доби з повною сіткою."""
+        if self._prefix is None:
+            object.__setattr__(
+                self,
+                "_prefix",
+                {
+                    date.fromisoformat(day): (half, prefix_counts(half))
+                    for day, half in self.days.items()
+                    if len(half) == SLOTS_PER_DAY
+                },
+            )
+        return self._prefix
+
+    def day_minutes(self, state: str, day_iso: Optional[str]) -> Optional[int]:
+        """Хвилини стану за всю добу; None, якщо сітки на цю добу нема."""
+        entry = self.slot_prefix.get(date.fromisoformat(day_iso)) if day_iso else None
+        if entry is None:
+            return None
+        return entry[1][state][SLOTS_PER_DAY] * SLOT_MINUTES
+
+    def state_minutes(self, state: str, start: datetime, end: datetime) -> int:
+        """Хвилини стану на [start; end) у межах відомих діб — O(1) (не більше двох діб).
+
+        Рахується за настінним часом Києва, як і сітка слотів: у дні переходу
+        на літній/зимовий час результат може відрізнятися на годину.
+        """
+        start_day, start_min = local_minute(start)
+        end_day, end_min = local_minute(end)
+        total = 0
+        for day, (half, prefix) in self.slot_prefix.items():
+            if day < start_day or day > end_day:
+                continue
+            m0 = start_min if day == start_day else 0
+            m1 = end_min if day == end_day else SLOTS_PER_DAY * SLOT_MINUTES
+            total += minutes_in_state(half, prefix[state], state, m0, m1)
+        return total
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Sequence
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN, SIGNAL_SCHEDULE_UPDATED
+from .model import ScheduleSnapshot
+from .schedule import SLOT_MINUTES, slot_time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Наскільки далеко назад шукати базову суму, якщо перед годиною є прогалина
+SUM_LOOKBACK_DAYS = 30
+
+
+@callback
+def async_setup_outage_statistics(hass: HomeAssistant) -> None:
+    """Пише погодинні хвилини відключень як зовнішню довгострокову статистику.
+
+    Оновлюється лише при зміні розкладу черги (той самий сигнал, що й websocket).
+    """
+    if "recorder" not in hass.config.components:
+        _LOGGER.debug("Recorder is not loaded — outage statistics disabled")
+        return
+
+    @callback
+    def _on_schedule_updated(coordinator, data: ScheduleSnapshot) -> None:
+        hass.async_create_task(
+            async_import_outage_statistics(hass, coordinator.region, coordinator.queue, data)
+        )
+
+    async_dispatcher_connect(hass, SIGNAL_SCHEDULE_UPDATED, _on_schedule_updated)
+
+
+def statistic_id_for(region: str, queue: str) -> str:
+    return f"{DOMAIN}:outage_minutes_{slugify(f'{region}_{queue}')}"
+
+
+def hourly_outage_minutes(day_iso: str, halfhours: Sequence[str]) -> list[tuple[datetime, int]]:
+    """Хвилини відключень по годинах (UTC) для локальної доби Europe/Kyiv."""
+    day = date.fromisoformat(day_iso)
+    start = slot_time(day, 0)
+    end = slot_time(day, 48)
+
+    buckets: dict[datetime, int] = {}
+    hour = start
+    while hour < end:
+        buckets[hour] = 0
+        hour += timedelta(hours=1)
+
+    for idx, state in enumerate(halfhours):
+        if state != "off":
+            continue
+        bucket = slot_time(day, idx).replace(minute=0, second=0, microsecond=0)
+        if bucket in buckets:
+            buckets[bucket] += SLOT_MINUTES
+
+    return sorted(buckets.items())
+
+
+async def async_import_outage_statistics(
+    hass: HomeAssistant, region: str, queue: str, data: ScheduleSnapshot
+) -> None:
+    days = data.days
+    if not days:
+        return
+    # Рекордер імпортуємо лише тут: без нього модуль не підключається зовсім,
+    # а з ним він уже завантажений до нас
+    from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+    from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+    rows: list[tuple[datetime, int]] = []
+    for day_iso in sorted(days):
+        rows.extend(hourly_outage_minutes(day_iso, days[day_iso]))
+
+    statistic_id = statistic_id_for(region, queue)
+    # Завтрашній графік зняли — години, вже імпортовані для нього, переписуємо нулями,
+    # інакше в статистиці лишаться відключення, яких уже не буде
+    next_day = (date.fromisoformat(max(days)) + timedelta(days=1)).isoformat()
+    withdrawn = hourly_outage_minutes(next_day, ())
+    if await _async_has_statistics(hass, statistic_id, withdrawn[0][0], withdrawn[-1][0]):
+        _LOGGER.debug("Schedule for %s withdrawn, zeroing its statistics", next_day)
+        rows.extend(withdrawn)
+
+    first_hour = rows[0][0]
+    running = await _async_sum_before(hass, statistic_id, first_hour)
+
+    statistics: list[StatisticData] = []
+    for start, minutes in rows:
+        running += minutes
+        statistics.append(StatisticData(start=start, state=minutes, sum=running))
+
+    metadata = StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=f"Svitlo {region} / {queue} outage minutes",
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement="min",
+    )
+    async_add_external_statistics(hass, metadata, statistics)
+    _LOGGER.debug("Imported %d hourly outage statistics for %s", len(statistics), statistic_id)
+
+
+async def _async_has_statistics(
+    hass: HomeAssistant, statistic_id: str, first_hour: datetime, last_hour: datetime
+) -> bool:
+    """Чи є в рекордері хоч одна година статистики з проміжку [first_hour, last_hour]."""
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.statistics import statistics_during_period
+
+    stats = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        first_hour,
+        last_hour + timedelta(hours=1),
+        {statistic_id},
+        "hour",
+        None,
+        {"state"},
+    )
+    return bool(stats.get(statistic_id))
+
+
+async def _async_sum_before(hass: HomeAssistant, statistic_id: str, start: datetime) -> float:
+    """Накопичена сума на годину, що передує `start` (0 для нової статистики).
+
+    Години, починаючи зі `start`, переписуються при кожній зміні розкладу,
+    тож база береться строго до них.
+    """
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.statistics import (
+        get_last_statistics,
+        statistics_during_period,
+    )
+
+    instance = get_instance(hass)
+    stats = await instance.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start - timedelta(hours=1),
+        start,
+        {statistic_id},
+        "hour",
+        None,
+        {"sum"},
+    )
+    rows = stats.get(statistic_id) or []
+    if not rows:
+        # Прогалина (HA був вимкнений) — беремо останню відому суму, якщо вона раніше
+        last = await instance.async_add_executor_job(
+            get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+        )
+        rows = [
+            row for row in last.get(statistic_id) or [] if _row_start(row) < start
+        ]
+    if not rows and last.get(statistic_id):
+        # Остання година вже не раніше `start` (прогалина всередині ряду) —
+        # шукаємо останню суму строго до `start` у ширшому вікні
+        stats = await instance.async_add_executor_job(
+            statistics_during_period,
+            hass,
+            start - timedelta(days=SUM_LOOKBACK_DAYS),
+            start,
+            {statistic_id},
+            "hour",
+            None,
+            {"sum"},
+        )
+        rows = stats.get(statistic_id) or []
+    return float(rows[-1].get("sum") or 0) if rows else 0.0
+
+
+def _row_start(row: dict[str, Any]) -> datetime:
+    start = row["start"]
+    if isinstance(start, datetime):
+        return start
+    return dt_util.utc_from_timestamp(start)
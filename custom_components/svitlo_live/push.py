@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import OFFLOAD_THRESHOLD_BYTES
+from .wire import decode_json
+
+_LOGGER = logging.getLogger(__name__)
+
+# Проксі шле коментар-пінг щонайменше раз на хвилину; тиша довше — з'єднання мертве
+PUSH_IDLE_TIMEOUT = 120
+
+# Пауза між перепідключеннями: 5 с -> ... -> 5 хв
+RECONNECT_MIN_SECONDS = 5
+RECONNECT_MAX_SECONDS = 300
+
+
+class SvitloPushListener:
+    """SSE-підписка на проксі: кожна подія `data:` — повний JSON розкладів.
+
+    `connected` — з першого рядка потоку (подія або keep-alive), а не з HTTP 200.
+    Поки з'єднання живе, координатори не опитують API (до PUSH_MAX_REUSE_SECONDS);
+    щойно воно рветься — працює звичайне опитування в `_async_update_data`.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        url: str,
+        on_document: Callable[[dict[str, Any], int], Awaitable[None]],
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> None:
+        self.hass = hass
+        self.url = url
+        self._on_document = on_document
+        self._session = session or async_get_clientsession(hass)
+        self._task: Optional[asyncio.Task] = None
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._run(), name="svitlo_live push listener"
+            )
+
+    async def async_stop(self) -> None:
+        self._connected = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                await self._listen()
+                delay = RECONNECT_MIN_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                _LOGGER.debug("Push stream %s unavailable: %s", self.url, e)
+            finally:
+                self._connected = False
+
+            _LOGGER.debug("Push stream closed, reconnecting in %s s (polling meanwhile)", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _listen(self) -> None:
+        timeout = aiohttp.ClientTimeout(total=None, connect=30, sock_read=PUSH_IDLE_TIMEOUT)
+        headers = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+        async with self._session.get(self.url, headers=headers, timeout=timeout) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status} for {self.url}")
+            _LOGGER.debug("Push stream opened: %s", self.url)
+
+            # Читаємо шматками: повний документ в одному `data:` довший за ліміт readline.
+            # Шматки незавершеного рядка збираємо в список і склеюємо раз — не O(n²)
+            pending: list[bytes] = []
+            data_lines: list[str] = []
+            async for chunk in resp.content.iter_any():
+                pending.append(chunk)
+                if b"\n" not in chunk:
+                    continue
+                *lines, tail = b"".join(pending).split(b"\n")
+                pending = [tail] if tail else []
+                if not self._connected:
+                    self._connected = True
+                    _LOGGER.debug("Push stream connected: %s", self.url)
+                for raw in lines:
+                    line = raw.decode("utf-8").rstrip("\r")
+                    if line:
+                        # ':' — коментар/keep-alive; інші поля (event/id/retry) нам не потрібні
+                        if line.startswith("data:"):
+                            # За специфікацією SSE знімається лише один пробіл після ':'
+                            data_lines.append(line[5:].removeprefix(" "))
+                        continue
+                    # Порожній рядок завершує подію
+                    if data_lines:
+                        await self._dispatch("\n".join(data_lines))
+                        data_lines = []
+
+    async def _dispatch(self, payload: str) -> None:
+        try:
+            if len(payload) >= OFFLOAD_THRESHOLD_BYTES:
+                document = await self.hass.async_add_executor_job(decode_json, payload)
+            else:
+                document = decode_json(payload)
+        except ValueError as e:
+            _LOGGER.debug("Push stream: malformed event ignored: %s", e)
+            return
+        if not isinstance(document, dict) or "regions" not in document:
+            _LOGGER.debug("Push stream: event without schedules ignored")
+            return
+        _LOGGER.debug("Push stream: schedule document received")
+        await self._on_document(document, len(payload))
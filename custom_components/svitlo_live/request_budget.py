@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import bisect
+import logging
+from datetime import datetime, time, timedelta
+from typing import Any, Optional, Sequence
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .schedule import TZ_KYIV
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.request_budget"
+STORAGE_VERSION = 1
+SAVE_DELAY = 30
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+# Звичайним фетчам дістається не більше 3/4 ліміту; решта — пріоритетним
+# (кешу нема або немає завтрашнього розкладу)
+PRIORITY_RESERVE_DIVISOR = 4
+
+Blackout = tuple[time, time]
+
+
+class RequestBudget:
+    """Бюджет запитів до проксі на весь HA: вікна тиші та ліміти на годину / добу.
+
+    Рахуються лише справжні запити в мережу (не файл-кеш і не push). Історія
+    за останню добу зберігається в .storage, тож рестарт HA не обнуляє ліміт.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_per_hour: Optional[int],
+        max_per_day: Optional[int],
+        blackouts: Sequence[Blackout],
+    ) -> None:
+        self.max_per_hour = max_per_hour
+        self.max_per_day = max_per_day
+        self.blackouts = tuple(blackouts)
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._fetches: list[float] = []  # UTC timestamp, за зростанням
+        self._loaded = False
+
+    async def async_check(self, now_utc: datetime, priority: bool) -> Optional[str]:
+        """None — фетч дозволено, інакше причина відмови (для логу / UpdateFailed)."""
+        window = self.blackout_at(now_utc)
+        if window is not None:
+            start, end = window
+            return f"blackout window {start:%H:%M}–{end:%H:%M} Europe/Kyiv"
+
+        if self.max_per_hour is None and self.max_per_day is None:
+            return None
+        await self._async_load()
+        now = now_utc.timestamp()
+        self._prune(now)
+        for limit, span, label in (
+            (self.max_per_hour, HOUR, "hour"),
+            (self.max_per_day, DAY, "day"),
+        ):
+            if limit is None:
+                continue
+            used = len(self._fetches) - bisect.bisect_right(
+                self._fetches, now - span.total_seconds()
+            )
+            allowed = limit if priority else limit - limit // PRIORITY_RESERVE_DIVISOR
+            if used >= allowed:
+                reserved = " (the rest is reserved for priority fetches)" if used < limit else ""
+                return f"{used}/{limit} fetches in the last {label}{reserved}"
+        return None
+
+    def record(self, now_utc: datetime) -> None:
+        """Фіксує запит у мережу (до його відправки — невдалий теж навантажує проксі)."""
+        if self.max_per_hour is None and self.max_per_day is None:
+            # Лімітів нема — історія нікому не потрібна і лише росла б без кінця
+            return
+        now = now_utc.timestamp()
+        self._fetches.append(now)
+        self._prune(now)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def blackout_at(self, now_utc: datetime) -> Optional[Blackout]:
+        local = now_utc.astimezone(TZ_KYIV).time()
+        for start, end in self.blackouts:
+            inside = start <= local < end if start <= end else (local >= start or local < end)
+            if inside:
+                return start, end
+        return None
+
+    def blackout_end(self, now_utc: datetime) -> Optional[datetime]:
+        """Кінець вікна тиші, в якому зараз `now_utc` (UTC), або None."""
+        window = self.blackout_at(now_utc)
+        if window is None:
+            return None
+        local = now_utc.astimezone(TZ_KYIV)
+        end = datetime.combine(local.date(), window[1], tzinfo=TZ_KYIV)
+        if end <= local:
+            end += DAY
+        return end.astimezone(now_utc.tzinfo)
+
+    async def _async_load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load()
+        if data:
+            stored = sorted(float(t) for t in data.get("fetches") or [])
+            # Запити, зроблені поки вантажили, лишаються в історії
+            self._fetches = sorted(stored + self._fetches)
+
+    def _prune(self, now: float) -> None:
+        cut = bisect.bisect_right(self._fetches, now - DAY.total_seconds())
+        if cut:
+            del self._fetches[:cut]
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"fetches": self._fetches}
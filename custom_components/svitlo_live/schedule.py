@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Mapping, Optional, Sequence
+
+from homeassistant.util import dt as dt_util
+
+# Півгодинна сітка доби
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 48
+
+# Розклади завжди в локальному часі України
+TZ_KYIV = dt_util.get_time_zone("Europe/Kyiv")
+
+# Компактні коди станів слоту для хешу / передачі
+_STATE_CODES = {"on": "1", "off": "0"}
+
+# Стани слоту, для яких ведуться префіксні суми
+SLOT_STATES = ("on", "off", "unknown")
+
+
+def slot_label(idx: int) -> str:
+    """Індекс слоту -> 'HH:MM' (48 -> '24:00' як кінець доби)."""
+    minutes = idx * SLOT_MINUTES
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def compact_slots(halfhours: Sequence[str]) -> str:
+    """48 станів -> рядок із 48 символів: '1' on, '0' off, '?' unknown."""
+    return "".join(_STATE_CODES.get(s, "?") for s in halfhours)
+
+
+def slot_time(day: date, idx: int) -> datetime:
+    """Початок слоту idx (48 — наступна північ) локальної доби Europe/Kyiv, в UTC."""
+    local_midnight = datetime.combine(day, time(), tzinfo=TZ_KYIV)
+    return dt_util.as_utc(local_midnight + timedelta(minutes=idx * SLOT_MINUTES))
+
+
+def run_lengths(halfhours: Sequence[str]) -> list[tuple[str, int, int]]:
+    """Стискає 48 станів у серії (state, start_idx, end_idx) з напіввідкритими межами."""
+    res: list[tuple[str, int, int]] = []
+    for i, state in enumerate(halfhours):
+        if res and res[-1][0] == state:
+            res[-1] = (state, res[-1][1], i + 1)
+        else:
+            res.append((state, i, i + 1))
+    return res
+
+
+def off_intervals(halfhours: Sequence[str]) -> list[tuple[int, int]]:
+    """Послідовності 'off' як напіввідкриті проміжки [start_idx; end_idx)."""
+    return _runs(i for i, s in enumerate(halfhours) if s == "off")
+
+
+def off_periods(day_iso: Optional[str], halfhours: Sequence[str]) -> list[tuple[datetime, datetime]]:
+    """Відключення доби як (start_utc, end_utc); порожньо, якщо сітка неповна."""
+    if not day_iso or len(halfhours) != SLOTS_PER_DAY:
+        return []
+    day = date.fromisoformat(day_iso)
+    return [(slot_time(day, a), slot_time(day, b)) for a, b in off_intervals(halfhours)]
+
+
+def prefix_counts(halfhours: Sequence[str]) -> dict[str, tuple[int, ...]]:
+    """{стан: p}, де p[i] — кількість слотів цього стану серед перших i (i = 0..48)."""
+    res: dict[str, tuple[int, ...]] = {}
+    for state in SLOT_STATES:
+        acc = [0]
+        for s in halfhours:
+            acc.append(acc[-1] + (s == state))
+        res[state] = tuple(acc)
+    return res
+
+
+def local_minute(t: datetime) -> tuple[date, int]:
+    """(локальна доба Europe/Kyiv, хвилина від її початку) для моменту часу."""
+    local = t.astimezone(TZ_KYIV)
+    return local.date(), local.hour * 60 + local.minute
+
+
+def minutes_in_state(
+    halfhours: Sequence[str], prefix: Sequence[int], state: str, m0: int, m1: int
+) -> int:
+    """Хвилини стану на [m0; m1) доби (0..1440) — O(1) за префіксними сумами `prefix`."""
+    if m1 <= m0:
+        return 0
+    a, ra = divmod(m0, SLOT_MINUTES)
+    b, rb = divmod(m1, SLOT_MINUTES)
+    if a == b:
+        return m1 - m0 if halfhours[a] == state else 0
+    total = (prefix[b] - prefix[a]) * SLOT_MINUTES
+    if ra and halfhours[a] == state:
+        total -= ra
+    if rb and halfhours[b] == state:
+        total += rb
+    return total
+
+
+Window = tuple[datetime, datetime]
+
+
+def on_windows(days: Mapping[str, Sequence[str]]) -> list[Window]:
+    """Індекс 'on'-вікон (UTC, напіввідкриті) по всіх добах, відсортований за початком.
+
+    Вікно, що триває через північ, склеюється в одне.
+    """
+    res: list[Window] = []
+    for day_iso in sorted(days):
+        halfhours = days[day_iso]
+        if len(halfhours) != SLOTS_PER_DAY:
+            continue
+        day = date.fromisoformat(day_iso)
+        for a, b in _runs(i for i, s in enumerate(halfhours) if s == "on"):
+            start, end = slot_time(day, a), slot_time(day, b)
+            if res and res[-1][1] == start:
+                res[-1] = (res[-1][0], end)
+            else:
+                res.append((start, end))
+    return res
+
+
+def state_transitions(days: Mapping[str, Sequence[str]]) -> list[tuple[datetime, str]]:
+    """Моменти переходів (UTC) по суміжних добах: (час, 'off') — початок відключення,
+    (час, 'on') — повернення світла після 'off'.
+
+    Перший слот відомого горизонту переходом не вважається (що було до нього — невідомо).
+    """
+    res: list[tuple[datetime, str]] = []
+    prev_state: Optional[str] = None
+    prev_day: Optional[date] = None
+    for day_iso in sorted(days):
+        halfhours = days[day_iso]
+        day = date.fromisoformat(day_iso)
+        if len(halfhours) != SLOTS_PER_DAY:
+            prev_state = prev_day = None
+            continue
+        if prev_day is None or day != prev_day + timedelta(days=1):
+            prev_state = None
+        for idx, state in enumerate(halfhours):
+            if prev_state is not None and state != prev_state:
+                if state == "off" or (state == "on" and prev_state == "off"):
+                    res.append((slot_time(day, idx), state))
+            prev_state = state
+        prev_day = day
+    return res
+
+
+def intersect_windows(a: Sequence[Window], b: Sequence[Window]) -> list[Window]:
+    """Перетин двох відсортованих наборів вікон (лінійний злиттям)."""
+    res: list[Window] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        start = max(a[i][0], b[j][0])
+        end = min(a[i][1], b[j][1])
+        if start < end:
+            res.append((start, end))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return res
+
+
+def clip_windows(
+    windows: Sequence[Window], start: datetime, end: Optional[datetime] = None
+) -> Iterable[Window]:
+    """Вікна, обрізані до [start; end) — пропуск минулих бінарним пошуком за кінцем."""
+    first = bisect.bisect_right(windows, start, key=lambda w: w[1])
+    for w_start, w_end in windows[first:]:
+        if end is not None and w_start >= end:
+            break
+        clipped = (max(w_start, start), min(w_end, end) if end is not None else w_end)
+        if clipped[0] < clipped[1]:
+            yield clipped
+
+
+def schedule_fingerprint(
+    date_today: Optional[str],
+    today_half: Sequence[str],
+    date_tomorrow: Optional[str],
+    tomorrow_half: Sequence[str],
+) -> str:
+    """Стабільний відбиток розкладу черги (не залежить від часу фетчу)."""
+    raw = f"{date_today}:{compact_slots(today_half)}|{date_tomorrow}:{compact_slots(tomorrow_half)}"
+    return hashlib.sha1(raw.encode("ascii")).hexdigest()[:16]
+
+
+def diff_off_slots(
+    old_half: Optional[Sequence[str]], new_half: Sequence[str]
+) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+    """Слотовий дифф відключень: (додані, прибрані) проміжки у форматі HH:MM."""
+    old_off = {i for i, s in enumerate(old_half or []) if s == "off"}
+    new_off = {i for i, s in enumerate(new_half) if s == "off"}
+    return (
+        _as_hhmm(_runs(sorted(new_off - old_off))),
+        _as_hhmm(_runs(sorted(old_off - new_off))),
+    )
+
+
+def _runs(indices) -> list[tuple[int, int]]:
+    res: list[tuple[int, int]] = []
+    for i in indices:
+        if res and res[-1][1] == i:
+            res[-1] = (res[-1][0], i + 1)
+        else:
+            res.append((i, i + 1))
+    return res
+
+
+def _as_hhmm(runs: list[tuple[int, int]]) -> list[dict[str, str]]:
+    return [{"start": slot_label(a), "end": slot_label(b)} for a, b in runs]
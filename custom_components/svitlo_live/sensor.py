@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Any, Optional
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
@@ -10,7 +10,9 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import DOMAIN, OUTAGE_HORIZON_HOURS
+from .model import ScheduleSnapshot
+from .schedule import SLOTS_PER_DAY, slot_time
 
 
 async def async_setup_entry(
@@ -24,6 +26,11 @@ async def async_setup_entry(
         SvitloMinutesToGridConnection(coordinator),      # minutes (number) — автооновлення кожні 30с
         SvitloMinutesToOutage(coordinator),              # minutes (number) — автооновлення кожні 30с
         SvitloScheduleUpdatedSensor(coordinator),        # TIMESTAMP
+        # Тривалості відключень — вимкнені за замовчуванням
+        SvitloOutageMinutesToday(coordinator),
+        SvitloOutageMinutesLeftToday(coordinator),
+        SvitloOutageMinutesTomorrow(coordinator),
+        SvitloOutageMinutesNextHours(coordinator),
     ]
     async_add_entities(entities)
 
@@ -37,6 +44,18 @@ class SvitloBaseEntity(CoordinatorEntity, SensorEntity):
         # Ентіті завжди доступна; “нема даних” показуємо значенням/None.
         return True
 
+    @property
+    def _snapshot(self) -> Optional[ScheduleSnapshot]:
+        """Знімок координатора або None, якщо даних нема чи останнє оновлення впало."""
+        if not self.coordinator.last_update_success:
+            return None
+        return self.coordinator.data
+
+    @property
+    def unique_id(self) -> str:
+        # Черга може змінитися на льоту (options flow) — ID завжди з координатора
+        return f"{self._unique_prefix}_{self.coordinator.region}_{self.coordinator.queue}"
+
     @property
     def device_info(self) -> dict[str, Any]:
         region = getattr(self.coordinator, "region", "region")
@@ -56,14 +75,14 @@ class SvitloStatusSensor(SvitloBaseEntity):
 
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"svitlo_status_{coordinator.region}_{coordinator.queue}"
+        self._unique_prefix = "svitlo_status"
 
     @property
     def native_value(self) -> str | None:
-        data = getattr(self.coordinator, "data", None)
-        if not data or not getattr(self.coordinator, "last_update_success", False):
+        snap = self._snapshot
+        if snap is None:
             return "No data"
-        val = data.get("now_status")  # "on"/"off"/"unknown"/"nosched"
+        val = snap.now_status  # "on"/"off"/"unknown"/"nosched"
         if val == "on":
             return "Grid ON"
         if val == "off":
@@ -83,17 +102,14 @@ class SvitloNextGridConnectionSensor(SvitloBaseEntity):
 
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"svitlo_next_grid_{coordinator.region}_{coordinator.queue}"
+        self._unique_prefix = "svitlo_next_grid"
 
     @property
-    def native_value(self):
-        d = getattr(self.coordinator, "data", None)
-        if not d or not getattr(self.coordinator, "last_update_success", False):
-            return None
-        if d.get("now_status") != "off":
+    def native_value(self) -> Optional[datetime]:
+        snap = self._snapshot
+        if snap is None or snap.now_status != "off":
             return None
-        iso_val = d.get("next_on_at")
-        return dt_util.parse_datetime(iso_val) if iso_val else None
+        return snap.next_on_at
 
 
 class SvitloNextOutageSensor(SvitloBaseEntity):
@@ -104,23 +120,20 @@ class SvitloNextOutageSensor(SvitloBaseEntity):
 
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"svitlo_next_off_{coordinator.region}_{coordinator.queue}"
+        self._unique_prefix = "svitlo_next_off"
 
     @property
-    def native_value(self):
-        d = getattr(self.coordinator, "data", None)
-        if not d or not getattr(self.coordinator, "last_update_success", False):
-            return None
-        if d.get("now_status") != "on":
+    def native_value(self) -> Optional[datetime]:
+        snap = self._snapshot
+        if snap is None or snap.now_status != "on":
             return None
-        iso_val = d.get("next_off_at")
-        return dt_util.parse_datetime(iso_val) if iso_val else None
+        return snap.next_off_at
 
 
 # ---------- Нові числові сенсори (хвилини до події) з локальним таймером ----------
 
 class _MinutesBase(SvitloBaseEntity):
-    """База для розрахунку хвилин до ISO-часу з автооновленням."""
+    """База для розрахунку хвилин до моменту часу з автооновленням."""
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = "min"
 
@@ -144,14 +157,11 @@ class _MinutesBase(SvitloBaseEntity):
             self._unsub_timer()
             self._unsub_timer = None
 
-    def _minutes_until(self, iso_utc: Optional[str]) -> Optional[int]:
+    def _minutes_until(self, target: Optional[datetime]) -> Optional[int]:
         """Повертає ceil різниці в хвилинах між target і поточним UTC.
         Якщо target немає — None. Якщо вже настав — 0.
         """
-        if not iso_utc:
-            return None
-        target = dt_util.parse_datetime(iso_utc)
-        if not target:
+        if target is None:
             return None
         now_utc = dt_util.utcnow()
         delta_s = (target - now_utc).total_seconds()
@@ -168,16 +178,14 @@ class SvitloMinutesToGridConnection(_MinutesBase):
 
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"svitlo_min_to_on_{coordinator.region}_{coordinator.queue}"
+        self._unique_prefix = "svitlo_min_to_on"
 
     @property
     def native_value(self) -> Optional[int]:
-        d = getattr(self.coordinator, "data", None)
-        if not d or not getattr(self.coordinator, "last_update_success", False):
-            return None
-        if d.get("now_status") != "off":
+        snap = self._snapshot
+        if snap is None or snap.now_status != "off":
             return None
-        return self._minutes_until(d.get("next_on_at"))
+        return self._minutes_until(snap.next_on_at)
 
 
 class SvitloMinutesToOutage(_MinutesBase):
@@ -187,16 +195,93 @@ class SvitloMinutesToOutage(_MinutesBase):
 
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"svitlo_min_to_off_{coordinator.region}_{coordinator.queue}"
+        self._unique_prefix = "svitlo_min_to_off"
+
+    @property
+    def native_value(self) -> Optional[int]:
+        snap = self._snapshot
+        if snap is None or snap.now_status != "on":
+            return None
+        return self._minutes_until(snap.next_off_at)
+
+
+# ---------- Тривалості відключень (префіксні суми знімка, O(1)) ----------
+# Усі чотири — MEASUREMENT: значення за поточним графіком, а не накопичувальний лічильник
+
+class SvitloOutageMinutesToday(SvitloBaseEntity):
+    """Хвилини відключень за сьогоднішню добу."""
+    _attr_name = "Outage minutes today"
+    _attr_icon = "mdi:timer-off-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "min"
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator)
+        self._unique_prefix = "svitlo_off_today"
+
+    @property
+    def native_value(self) -> Optional[int]:
+        snap = self._snapshot
+        return snap.day_minutes("off", snap.date) if snap else None
+
+
+class SvitloOutageMinutesTomorrow(SvitloBaseEntity):
+    """Хвилини відключень завтра (None, доки графік не опубліковано)."""
+    _attr_name = "Outage minutes tomorrow"
+    _attr_icon = "mdi:timer-off-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "min"
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator)
+        self._unique_prefix = "svitlo_off_tomorrow"
+
+    @property
+    def native_value(self) -> Optional[int]:
+        snap = self._snapshot
+        return snap.day_minutes("off", snap.tomorrow_date) if snap else None
+
+
+class SvitloOutageMinutesLeftToday(_MinutesBase):
+    """Хвилини відключень від зараз до кінця сьогоднішньої доби."""
+    _attr_name = "Outage minutes remaining today"
+    _attr_icon = "mdi:timer-off-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator)
+        self._unique_prefix = "svitlo_off_left_today"
 
     @property
     def native_value(self) -> Optional[int]:
-        d = getattr(self.coordinator, "data", None)
-        if not d or not getattr(self.coordinator, "last_update_success", False):
+        snap = self._snapshot
+        if snap is None or not snap.today_48half:
             return None
-        if d.get("now_status") != "on":
+        day_end = slot_time(datetime.fromisoformat(snap.date).date(), SLOTS_PER_DAY)
+        return snap.state_minutes("off", dt_util.utcnow(), day_end)
+
+
+class SvitloOutageMinutesNextHours(_MinutesBase):
+    """Хвилини відключень у найближчі OUTAGE_HORIZON_HOURS год (у межах відомого графіка)."""
+    _attr_name = f"Outage minutes next {OUTAGE_HORIZON_HOURS} h"
+    _attr_icon = "mdi:timer-off-outline"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator)
+        self._unique_prefix = "svitlo_off_next_hours"
+
+    @property
+    def native_value(self) -> Optional[int]:
+        snap = self._snapshot
+        if snap is None or not snap.today_48half:
             return None
-        return self._minutes_until(d.get("next_off_at"))
+        now = dt_util.utcnow()
+        return snap.state_minutes("off", now, now + timedelta(hours=OUTAGE_HORIZON_HOURS))
 
 
 # ---------- Updated timestamp for “Schedule Updated” ----------
@@ -209,12 +294,15 @@ class SvitloScheduleUpdatedSensor(SvitloBaseEntity):
 
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"svitlo_updated_{coordinator.region}_{coordinator.queue}"
+        self._unique_prefix = "svitlo_updated"
 
     @property
-    def native_value(self):
-        d = getattr(self.coordinator, "data", None)
-        if not d:
-            return None
-        iso_val = d.get("updated")
-        return dt_util.parse_datetime(iso_val) if iso_val else None
+    def native_value(self) -> Optional[datetime]:
+        snap = self.coordinator.data
+        return snap.updated if snap else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        snap = self.coordinator.data
+        # Відбиток змінюється лише зі зміною слотів, а не з кожним опитуванням
+        return {"schedule_hash": snap.schedule_hash if snap else None}
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from functools import reduce
+from typing import Any, Iterable, Optional, Sequence
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import SvitloCoordinator, async_get_coordinators
+from .model import ScheduleSnapshot
+from .schedule import Window, clip_windows, intersect_windows, run_lengths, slot_time
+
+SERVICE_GET_SCHEDULE = "get_schedule"
+SERVICE_FIND_POWER_WINDOWS = "find_power_windows"
+
+ATTR_ENTRY_ID = "entry_id"
+ATTR_MIN_DURATION = "min_duration"
+ATTR_COUNT = "count"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_MODE = "mode"
+ATTR_ALL_ON = "all_on"
+
+MODE_NEXT = "next"
+MODE_LONGEST = "longest"
+
+GET_SCHEDULE_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string])}
+)
+
+FIND_POWER_WINDOWS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MIN_DURATION, default=timedelta(minutes=30)): cv.positive_time_period,
+        vol.Optional(ATTR_COUNT, default=3): vol.All(vol.Coerce(int), vol.Range(min=1, max=48)),
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_MODE, default=MODE_NEXT): vol.In([MODE_NEXT, MODE_LONGEST]),
+        vol.Optional(ATTR_ALL_ON, default=False): cv.boolean,
+    }
+)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    async def _async_get_schedule(call: ServiceCall) -> ServiceResponse:
+        return async_get_schedule(hass, call)
+
+    async def _async_find_power_windows(call: ServiceCall) -> ServiceResponse:
+        return async_find_power_windows(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SCHEDULE,
+        _async_get_schedule,
+        schema=GET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_POWER_WINDOWS,
+        _async_find_power_windows,
+        schema=FIND_POWER_WINDOWS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _selected_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, SvitloCoordinator]:
+    """Координатори з entry_id виклику (усі, якщо entry_id не задано)."""
+    coordinators = async_get_coordinators(hass)
+    wanted = call.data.get(ATTR_ENTRY_ID)
+    if not wanted:
+        return coordinators
+    missing = [entry_id for entry_id in wanted if entry_id not in coordinators]
+    if missing:
+        raise HomeAssistantError(f"Unknown Svitlo Live entry: {', '.join(missing)}")
+    return {entry_id: coordinators[entry_id] for entry_id in wanted}
+
+
+def _day_intervals(
+    snap: ScheduleSnapshot, day_iso: str | None, halfhours: Sequence[str]
+) -> dict[str, Any] | None:
+    if not day_iso:
+        return None
+    day = date.fromisoformat(day_iso)
+    return {
+        "date": day_iso,
+        "off_minutes": snap.day_minutes("off", day_iso),
+        "intervals": [
+            {
+                "state": state,
+                "start": slot_time(day, start).isoformat(),
+                "end": slot_time(day, end).isoformat(),
+            }
+            for state, start, end in run_lengths(halfhours)
+        ],
+    }
+
+
+@callback
+def async_get_schedule(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Розклади з кешу координаторів (без мережі) як серії on/off/unknown у UTC."""
+    entries: dict[str, Any] = {}
+    for entry_id, coordinator in _selected_coordinators(hass, call).items():
+        snap = coordinator.data
+        entries[entry_id] = {
+            "region": coordinator.region,
+            "queue": coordinator.queue,
+            "status": snap.now_status if snap else None,
+            "today": _day_intervals(snap, snap.date, snap.today_48half) if snap else None,
+            "tomorrow": (
+                _day_intervals(snap, snap.tomorrow_date, snap.tomorrow_48half) if snap else None
+            ),
+        }
+    return {"entries": entries}
+
+
+@callback
+def async_find_power_windows(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Найближчі N 'on'-вікон ≥ min_duration (або найдовше в діапазоні) з індексу знімків.
+
+    all_on — вікна, коли світло є в усіх обраних черг одночасно (перетин індексів).
+    """
+    coordinators = _selected_coordinators(hass, call)
+    start = _as_utc(call.data.get(ATTR_START)) or dt_util.utcnow()
+    end = _as_utc(call.data.get(ATTR_END))
+    if end is not None and end <= start:
+        raise HomeAssistantError("end must be after start")
+
+    def _query(windows: Sequence[Window]) -> list[dict[str, Any]]:
+        return _windows_response(
+            _pick(
+                clip_windows(windows, start, end),
+                call.data[ATTR_MODE],
+                call.data[ATTR_MIN_DURATION],
+                call.data[ATTR_COUNT],
+            )
+        )
+
+    indexes = {
+        entry_id: coordinator.data.on_windows if coordinator.data else ()
+        for entry_id, coordinator in coordinators.items()
+    }
+
+    if call.data[ATTR_ALL_ON]:
+        common = reduce(intersect_windows, indexes.values()) if indexes else []
+        return {"all_on": {"entry_ids": list(indexes), "windows": _query(common)}}
+
+    return {
+        "entries": {
+            entry_id: {
+                "region": coordinator.region,
+                "queue": coordinator.queue,
+                "windows": _query(indexes[entry_id]),
+            }
+            for entry_id, coordinator in coordinators.items()
+        }
+    }
+
+
+def _pick(
+    windows: Iterable[Window], mode: str, min_duration: timedelta, count: int
+) -> list[Window]:
+    if mode == MODE_LONGEST:
+        longest = max(windows, key=lambda w: w[1] - w[0], default=None)
+        return [longest] if longest is not None and longest[1] - longest[0] >= min_duration else []
+
+    res: list[Window] = []
+    for window in windows:
+        if window[1] - window[0] >= min_duration:
+            res.append(window)
+            if len(res) >= count:
+                break
+    return res
+
+
+def _windows_response(windows: list[Window]) -> list[dict[str, Any]]:
+    return [
+        {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "minutes": int((end - start).total_seconds() // 60),
+        }
+        for start, end in windows
+    ]
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Час зі служби -> UTC; наївний трактуємо як локальний час HA."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    return dt_util.as_utc(value)
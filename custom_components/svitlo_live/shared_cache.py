@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows — без міжпроцесного локу, лише атомарна заміна файлу
+    fcntl = None
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .model import SharedDocument
+from .wire import compact_document
+
+_LOGGER = logging.getLogger(__name__)
+
+# Скільки чекаємо, поки інший інстанс допише файл, перш ніж фетчити самим (сек)
+LOCK_WAIT_SECONDS = 20
+LOCK_POLL_SECONDS = 0.25
+
+
+class SharedScheduleCache:
+    """Файловий кеш JSON розкладів, спільний для кількох інстансів HA на одному хості.
+
+    Копія свіжа, доки молодша за `max_age`. Оновлює її той інстанс, що першим
+    узяв flock на `<path>.lock`; решта чекають на файл, а не йдуть в API.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str, max_age: float) -> None:
+        self.hass = hass
+        self.path = Path(path)
+        self.max_age = max_age
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock_fd: Optional[int] = None
+
+        # Останній прочитаний файл: той самий mtime — не декодуємо повторно
+        self._loaded_mtime_ns: Optional[int] = None
+        self._loaded: Optional[SharedDocument] = None
+
+    async def async_load(self) -> Optional[SharedDocument]:
+        """Свіжа копія з файлу або None (файлу нема, застарів або битий)."""
+        now = dt_util.utcnow()
+        try:
+            st = await self.hass.async_add_executor_job(os.stat, self.path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            _LOGGER.debug("Shared cache %s unavailable: %s", self.path, e)
+            return None
+
+        if st.st_mtime_ns != self._loaded_mtime_ns:
+            try:
+                copy = await self.hass.async_add_executor_job(_read_copy, self.path)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                _LOGGER.debug("Ignoring unreadable shared cache %s: %s", self.path, e)
+                return None
+            self._loaded_mtime_ns = st.st_mtime_ns
+            self._loaded = copy
+
+        copy = self._loaded
+        if copy is None or (now - copy.fetched_utc).total_seconds() >= self.max_age:
+            return None
+        return copy
+
+    async def async_store(self, doc: SharedDocument) -> None:
+        try:
+            mtime_ns = await self.hass.async_add_executor_job(
+                _write_copy, self.path, doc.document, doc.fetched_utc
+            )
+        except OSError as e:
+            _LOGGER.warning("Failed to write Svitlo Live shared cache %s: %s", self.path, e)
+            return
+        # Свій запис не перечитуємо: файл = той самий документ, що вже в пам'яті
+        self._loaded_mtime_ns = mtime_ns
+        self._loaded = doc
+
+    @asynccontextmanager
+    async def async_refresh_lock(self) -> AsyncIterator[Optional[SharedDocument]]:
+        """Міжпроцесний лок на оновлення файлу.
+
+        Віддає свіжу копію, якщо її встиг записати інший інстанс, поки ми чекали
+        на лок (тоді фетч не потрібен), інакше None — фетчимо й пишемо самі.
+        Якщо лок не звільнився за LOCK_WAIT_SECONDS — працюємо без нього.
+        """
+        locked = await self._async_acquire()
+        try:
+            yield await self.async_load()
+        finally:
+            if locked:
+                self._release()
+
+    async def async_close(self) -> None:
+        if self._lock_fd is not None:
+            fd, self._lock_fd = self._lock_fd, None
+            await self.hass.async_add_executor_job(os.close, fd)
+
+    async def _async_acquire(self) -> bool:
+        if fcntl is None:
+            return False
+        if self._lock_fd is None:
+            try:
+                self._lock_fd = await self.hass.async_add_executor_job(_open_lock, self._lock_path)
+            except OSError as e:
+                _LOGGER.debug("Shared cache lock %s unavailable: %s", self._lock_path, e)
+                return False
+
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while True:
+            try:
+                # LOCK_NB не блокує — безпечно викликати просто в event loop
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    _LOGGER.debug("Shared cache lock %s is busy, fetching without it", self._lock_path)
+                    return False
+                await asyncio.sleep(LOCK_POLL_SECONDS)
+
+    def _release(self) -> None:
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+
+def _open_lock(path: Path) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+
+def _read_copy(path: Path) -> SharedDocument:
+    raw = path.read_bytes()
+    data = json_loads(raw)
+    fetched = dt_util.parse_datetime(data["fetched_utc"])
+    if fetched is None or not isinstance(data["document"], dict):
+        raise ValueError("missing fetched_utc or document")
+    # Файли старих версій — зі словниками слотів
+    compact_document(data["document"])
+    return SharedDocument(data["document"], dt_util.as_utc(fetched), len(raw))
+
+
+def _write_copy(path: Path, document: dict[str, Any], fetched_utc: datetime) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Унікальний tmp на процес + os.replace: читачі бачать або старий, або новий файл
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(json_bytes({"fetched_utc": fetched_utc.isoformat(), "document": document}))
+    os.replace(tmp, path)
+    return path.stat().st_mtime_ns
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .wire import expand_document
+
+_LOGGER = logging.getLogger(__name__)
+
+# Ім'я файлу = момент отримання (UTC), тож лексикографічний порядок = хронологічний
+_NAME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+
+async def async_record_snapshot(
+    hass: HomeAssistant, directory: str, fetched_utc: datetime, api: dict[str, Any]
+) -> None:
+    """Зберігає отриманий документ у форматі JSON проксі разом із часом отримання (режим запису).
+
+    У пам'яті слоти стиснуті в рядки кодів; у файл іде розгорнута копія, як її шле проксі.
+    """
+    try:
+        await hass.async_add_executor_job(_write_snapshot, Path(directory), fetched_utc, api)
+    except OSError as e:
+        _LOGGER.warning("Failed to record Svitlo Live snapshot to %s: %s", directory, e)
+
+
+def _write_snapshot(directory: Path, fetched_utc: datetime, api: dict[str, Any]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    name = dt_util.as_utc(fetched_utc).strftime(_NAME_FORMAT) + ".json"
+    tmp = directory / (name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(
+            {"fetched_utc": fetched_utc.isoformat(), "document": expand_document(api)},
+            f,
+            ensure_ascii=False,
+        )
+    tmp.replace(directory / name)
+
+
+def load_snapshots(directory: str | Path) -> list[tuple[datetime, dict[str, Any]]]:
+    """Читає записані знімки, відсортовані за часом отримання."""
+    res: list[tuple[datetime, dict[str, Any]]] = []
+    for path in sorted(Path(directory).glob("*.json")):
+        with path.open(encoding="utf-8") as f:
+            raw = json.load(f)
+        fetched = dt_util.parse_datetime(raw["fetched_utc"])
+        if fetched is None:
+            _LOGGER.debug("Skipping snapshot %s without valid timestamp", path.name)
+            continue
+        res.append((dt_util.as_utc(fetched), raw["document"]))
+    res.sort(key=lambda item: item[0])
+    return res
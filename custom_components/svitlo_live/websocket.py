@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import SIGNAL_SCHEDULE_UPDATED
+from .coordinator import SvitloCoordinator, async_get_coordinators
+from .model import ScheduleSnapshot
+
+
+@callback
+def async_register_websocket(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe_schedule)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "svitlo_live/subscribe_schedule",
+        vol.Optional("entry_ids"): [str],
+    }
+)
+@callback
+def ws_subscribe_schedule(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Компактний розклад обраних entry + дельти (лише змінені доби) при змінах."""
+    wanted = set(msg["entry_ids"]) if "entry_ids" in msg else None
+    sent: dict[str, dict[str, str]] = {}
+
+    initial: dict[str, Any] = {}
+    for entry_id, coordinator in async_get_coordinators(hass).items():
+        if wanted is not None and entry_id not in wanted:
+            continue
+        data: ScheduleSnapshot | None = coordinator.data
+        sent[entry_id] = data.compact_days if data else {}
+        initial[entry_id] = {
+            "region": coordinator.region,
+            "queue": coordinator.queue,
+            "hash": data.schedule_hash if data else None,
+            "days": sent[entry_id],
+        }
+
+    @callback
+    def _on_schedule_updated(coordinator: SvitloCoordinator, data: ScheduleSnapshot) -> None:
+        entry_id = coordinator.entry_id
+        if entry_id is None or (wanted is not None and entry_id not in wanted):
+            return
+        days = data.compact_days
+        old = sent.get(entry_id, {})
+        changed = {day: slots for day, slots in days.items() if old.get(day) != slots}
+        removed = [day for day in old if day not in days]
+        sent[entry_id] = days
+        if not changed and not removed:
+            return
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "entries": {
+                        entry_id: {
+                            "region": coordinator.region,
+                            "queue": coordinator.queue,
+                            "hash": data.schedule_hash,
+                            "days": changed,
+                            "removed": removed,
+                        }
+                    }
+                },
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_SCHEDULE_UPDATED, _on_schedule_updated
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], {"entries": initial}))
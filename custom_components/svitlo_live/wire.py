@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import struct
+from typing import Any, Mapping, Union
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .schedule import SLOTS_PER_DAY, slot_label
+
+# Компактний формат документа проксі (узгоджується через Accept, інакше — JSON):
+#
+#   b"SVP1" | u32 BE довжина заголовка | заголовок (JSON) | слоти
+#
+# Заголовок: {"document": поля верхнього рівня без regions, "dates": [iso, ...],
+#             "regions": [{поля регіону без schedule, "queues": [[черга, маска дат], ...]}]}
+# Слоти: для кожної черги й кожної дати з її маски (біт i — dates[i]) — 12 байт,
+# 48 кодів по 2 біти, слот 0 у старших бітах першого байта.
+PACKED_CONTENT_TYPE = "application/vnd.svitlo.packed"
+PACKED_MAGIC = b"SVP1"
+
+_HEADER_LEN = struct.Struct(">I")
+_DAY_BYTES = SLOTS_PER_DAY // 4
+_LABELS = tuple(slot_label(i) for i in range(SLOTS_PER_DAY))
+
+# Байт -> 4 коди слотів; 3 («інше») читається як 0 (невідомо)
+_BYTE_CODES = tuple(
+    "".join(str(c if c < 3 else 0) for c in ((b >> 6) & 3, (b >> 4) & 3, (b >> 2) & 3, b & 3))
+    for b in range(256)
+)
+
+# Слоти доби в документі: {"HH:MM": код} (JSON проксі) або 48 символів-кодів (SVP1)
+DaySlots = Union[Mapping[str, Any], str]
+
+
+def slot_codes(slots: DaySlots) -> str:
+    """Слоти доби в будь-якій формі -> 48 символів '0' / '1' / '2'."""
+    if isinstance(slots, str):
+        return slots
+    return "".join(_code_char(slots.get(label, 0)) for label in _LABELS)
+
+
+def slot_map(slots: DaySlots) -> dict[str, int]:
+    """Слоти доби -> {"HH:MM": код}, як у JSON проксі."""
+    if isinstance(slots, str):
+        return dict(zip(_LABELS, map(int, slots)))
+    return dict(slots)
+
+
+def compact_document(data: Any) -> Any:
+    """Слоти свіжо декодованого документа або патча -> рядки кодів (на місці).
+
+    Доба займає ~100 байт замість словника з 48 ключів — у пам'яті документ
+    разів у десять менший, а координатори беруть коди без перетворень.
+    """
+    if not isinstance(data, dict):
+        return data
+    if data.get("type") == "patch":
+        per_dates = [change.get("dates") or {} for change in data.get("changes") or []]
+    else:
+        per_dates = [
+            per_date
+            for region in data.get("regions") or []
+            for per_date in (region.get("schedule") or {}).values()
+        ]
+    for per_date in per_dates:
+        for day, slots in per_date.items():
+            # Неповну добу лишаємо словником: рядок не відтворить її для checksum патчів
+            if isinstance(slots, Mapping) and len(slots) == SLOTS_PER_DAY:
+                per_date[day] = slot_codes(slots)
+    return data
+
+
+def expand_document(document: Mapping[str, Any]) -> dict[str, Any]:
+    """Копія документа у формі JSON проксі: слоти знову {"HH:MM": код}; оригінал не змінюється."""
+    return {
+        **document,
+        "regions": [
+            {
+                **region,
+                "schedule": {
+                    queue: {day: slot_map(slots) for day, slots in per_date.items()}
+                    for queue, per_date in (region.get("schedule") or {}).items()
+                },
+            }
+            for region in document.get("regions") or []
+        ],
+    }
+
+
+def decode_json(body: bytes | str) -> Any:
+    """JSON проксі (документ, патч або SSE-подія) -> та сама внутрішня форма, що й SVP1."""
+    return compact_document(json_loads(body))
+
+
+def decode_packed(body: bytes) -> dict[str, Any]:
+    """SVP1 -> документ проксі; слоти кожної доби — рядок із 48 кодів."""
+    if body[:4] != PACKED_MAGIC:
+        raise ValueError("Not an SVP1 document")
+    (header_len,) = _HEADER_LEN.unpack_from(body, 4)
+    offset = 8 + header_len
+    header = json_loads(body[8:offset])
+    dates: list[str] = header["dates"]
+    # Усі слоти розгортаються в коди одним проходом, далі — лише зрізи по 48
+    codes = "".join(map(_BYTE_CODES.__getitem__, body[offset:]))
+    pos = 0
+
+    regions: list[dict[str, Any]] = []
+    for region_head in header["regions"]:
+        region = {k: v for k, v in region_head.items() if k != "queues"}
+        schedule: dict[str, dict[str, str]] = {}
+        for queue, mask in region_head["queues"]:
+            per_date: dict[str, str] = {}
+            for i, day in enumerate(dates):
+                if mask >> i & 1:
+                    per_date[day] = codes[pos : pos + SLOTS_PER_DAY]
+                    pos += SLOTS_PER_DAY
+            schedule[queue] = per_date
+        region["schedule"] = schedule
+        regions.append(region)
+
+    if pos != len(codes):
+        raise ValueError(f"SVP1 slot data size mismatch: {len(codes)} codes, {pos} expected")
+    return {**header["document"], "regions": regions}
+
+
+def encode_packed(document: Mapping[str, Any]) -> bytes:
+    """Документ проксі -> SVP1 (еталон для проксі та локальних стендів)."""
+    dates = sorted(
+        {
+            day
+            for region in document.get("regions", [])
+            for per_date in (region.get("schedule") or {}).values()
+            for day in per_date
+        }
+    )
+    date_bit = {day: 1 << i for i, day in enumerate(dates)}
+    slots = bytearray()
+    regions: list[dict[str, Any]] = []
+    for region in document.get("regions", []):
+        queues: list[list[Any]] = []
+        for queue, per_date in (region.get("schedule") or {}).items():
+            mask = 0
+            for day in dates:
+                if day in per_date:
+                    mask |= date_bit[day]
+                    slots += _pack_day(slot_codes(per_date[day]))
+            queues.append([queue, mask])
+        regions.append({**{k: v for k, v in region.items() if k != "schedule"}, "queues": queues})
+
+    header = json_bytes(
+        {
+            "document": {k: v for k, v in document.items() if k != "regions"},
+            "dates": dates,
+            "regions": regions,
+        }
+    )
+    return PACKED_MAGIC + _HEADER_LEN.pack(len(header)) + header + bytes(slots)
+
+
+def _pack_day(codes: str) -> bytes:
+    out = bytearray(_DAY_BYTES)
+    for i, ch in enumerate(codes[:SLOTS_PER_DAY]):
+        out[i >> 2] |= (ord(ch) - 48 & 3) << (6 - 2 * (i & 3))
+    return bytes(out)
+
+
+def _code_char(code: Any) -> str:
+    try:
+        value = int(code)
+    except (TypeError, ValueError):
+        return "0"
+    return str(value) if value in (1, 2) else "0"
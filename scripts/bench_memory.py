@@ -0,0 +1,187 @@
+"""Memory-footprint benchmark for Svitlo Live at 1, 20 and 200 entries.
+
+    python scripts/bench_memory.py
+    python scripts/bench_memory.py --sizes 1 20 200 --budget 200=30
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import replay  # noqa: E402  (той самий каталог; додає корінь репо в sys.path)
+
+from homeassistant.helpers.json import json_bytes  # noqa: E402
+
+from custom_components.svitlo_live.config_flow import _queue_options_for_region  # noqa: E402
+from custom_components.svitlo_live.const import DOMAIN, REGIONS  # noqa: E402
+from custom_components.svitlo_live.wire import decode_json  # noqa: E402
+from pytest_homeassistant_custom_component.common import async_test_home_assistant  # noqa: E402
+
+DAY = date(2025, 11, 17)
+
+# Стеля allocated (МіБ) на розмір; з запасом ~1.5x від заміряного
+DEFAULT_BUDGETS_MB = {1: 1.0, 20: 3.5, 200: 26.0}
+
+PRELOADED_MODULES = tuple(
+    f"custom_components.svitlo_live.{name}"
+    for name in ("binary_sensor", "sensor", "calendar", "services", "websocket", "ics")
+)
+
+
+class _WireSource(replay.TimelineSource):
+    """Як TimelineSource, але кожен фетч декодує нову копію документа декодером клієнта."""
+
+    def __init__(self, timeline) -> None:
+        super().__init__(timeline)
+        self._bodies = [json_bytes(doc) for doc in self._docs]
+
+    def document_at(self, when):
+        doc = super().document_at(when)
+        return decode_json(self._bodies[self._docs.index(doc)])
+
+
+def _alive_documents() -> int:
+    """Скільки декодованих документів проксі ще досяжні (поза таймлайном стенда)."""
+    return sum(
+        1
+        for obj in gc.get_objects()
+        if type(obj) is dict and "regions" in obj and "date_today" in obj
+    )
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _entries(count: int) -> list[tuple[str, str]]:
+    pairs = [
+        (region, queue) for region in REGIONS for queue in _queue_options_for_region(region)[0]
+    ]
+    if count > len(pairs):
+        raise SystemExit(f"only {len(pairs)} distinct region/queue pairs available")
+    return pairs[:count]
+
+
+async def _async_measure(count: int) -> dict[str, Any]:
+    timeline = replay.synthetic_timeline(DAY, 2)
+    source = _WireSource(timeline)
+    # 19:00 за Києвом: о 20:00 з'являється завтрашній графік
+    start_utc = source.start + timedelta(hours=19)
+    stats = replay.ReplayStats()
+
+    with tempfile.TemporaryDirectory() as storage:
+        async with async_test_home_assistant(storage_dir=storage) as hass:
+            clock = replay.VirtualClock(hass.loop, start_utc)
+            with clock.installed(), replay._instrumented(stats, clock, source):
+                await hass.async_block_till_done()
+                # Модулі платформ (і компоненти HA, які вони тягнуть) — до заміру:
+                # рахуємо лише стан під час роботи, а не код
+                for module in PRELOADED_MODULES:
+                    importlib.import_module(module)
+                gc.collect()
+                documents_before = _alive_documents()
+                rss_before = _rss_bytes()
+                tracemalloc.start()
+                base_current, _ = tracemalloc.get_traced_memory()
+
+                await replay.async_setup_entries(hass, _entries(count))
+                await clock.run_until(hass, start_utc + timedelta(hours=2))
+
+                gc.collect()
+                current, peak = tracemalloc.get_traced_memory()
+                rss_after = _rss_bytes()
+                documents = _alive_documents() - documents_before
+                by_file = tracemalloc.take_snapshot().statistics("filename")
+                tracemalloc.stop()
+                coordinators = sum(
+                    1 for key in hass.data.get(DOMAIN, {}) if not str(key).startswith("_")
+                )
+                await hass.async_stop(force=True)
+
+    allocated = current - base_current
+    return {
+        "entries": count,
+        "coordinators": coordinators,
+        "fetches": stats.fetches,
+        "allocated_mb": round(allocated / 2**20, 2),
+        "allocated_peak_mb": round((peak - base_current) / 2**20, 2),
+        "allocated_per_entry_kb": round(allocated / 1024 / count, 1),
+        "integration_kb": sum(
+            stat.size for stat in by_file if "svitlo_live" in stat.traceback[0].filename
+        ) // 1024,
+        "documents_alive": documents,
+        "rss_growth_mb": (
+            round((rss_after - rss_before) / 2**20, 2)
+            if rss_before is not None and rss_after is not None
+            else None
+        ),
+        "top_files": {
+            stat.traceback[0].filename.split("site-packages/")[-1]: stat.size // 1024
+            for stat in by_file[:5]
+        },
+    }
+
+
+def _parse_budget(raw: str) -> tuple[int, float]:
+    size, _, limit = raw.partition("=")
+    try:
+        return int(size), float(limit)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"expected <entries>=<MiB>, got {raw!r}") from e
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=sorted(DEFAULT_BUDGETS_MB))
+    parser.add_argument(
+        "--budget", type=_parse_budget, action="append", default=[],
+        help="стеля allocated для розміру, напр. 200=40 (МіБ)",
+    )
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(asyncio.run(_async_measure(args.child))))
+        return
+
+    budgets = {**DEFAULT_BUDGETS_MB, **dict(args.budget)}
+    results: list[dict[str, Any]] = []
+    failures: list[str] = []
+    for size in args.sizes:
+        # Окремий процес на розмір — RSS і купа не змішуються між замірами
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", str(size)],
+            capture_output=True, text=True, check=False,
+        )
+        if proc.returncode != 0:
+            failures.append(f"{size} entries: benchmark run failed\n{proc.stderr[-2000:]}")
+            continue
+        res = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append(res)
+        limit = budgets.get(size)
+        if limit is not None and res["allocated_mb"] > limit:
+            failures.append(f"{size} entries: {res['allocated_mb']} MiB allocated > {limit} MiB")
+        if res["documents_alive"] > 1:
+            failures.append(f"{size} entries: {res['documents_alive']} proxy documents kept alive")
+
+    print(json.dumps({"budgets_mb": budgets, "results": results, "failures": failures}, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
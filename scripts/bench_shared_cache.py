@@ -0,0 +1,179 @@
+"""Contention benchmark for the process-wide schedule cache of Svitlo Live.
+
+    python scripts/bench_shared_cache.py
+    python scripts/bench_shared_cache.py --coordinators 1000 --delay-ms 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from typing import Any
+
+from aiohttp import web
+
+import replay  # noqa: E402  (той самий каталог; додає корінь репо в sys.path)
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.common import async_test_home_assistant  # noqa: E402
+
+from custom_components.svitlo_live.client import SvitloClient  # noqa: E402
+from custom_components.svitlo_live.const import CONF_QUEUE, CONF_REGION, DOMAIN  # noqa: E402
+from custom_components.svitlo_live.coordinator import (  # noqa: E402
+    MIN_REUSE_SECONDS,
+    SvitloCoordinator,
+)
+
+ENTRY = ("kyiv", "1.1")
+
+
+class StandInProxy:
+    """Локальний замінник проксі: рахує запити, відповідає із затримкою."""
+
+    def __init__(self, document: dict[str, Any], delay: float) -> None:
+        self.body = json.dumps(document).encode()
+        self.delay = delay
+        self.hits = 0
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        await asyncio.sleep(self.delay)
+        return web.Response(body=self.body, content_type="application/json")
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def _wave(coordinators: list[SvitloCoordinator]) -> tuple[list[float], float]:
+    """Одночасний refresh усіх координаторів: латентність кожного й усієї хвилі (мс)."""
+
+    async def _one(coordinator: SvitloCoordinator) -> float:
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    latencies = list(await asyncio.gather(*(_one(c) for c in coordinators)))
+    return latencies, (time.perf_counter() - started) * 1000
+
+
+def _summary(
+    name: str, hits: int, latencies: list[float], wall_ms: float, failed: int
+) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "wave": name,
+        "network_requests": hits,
+        "failed": failed,
+        "wall_ms": round(wall_ms, 2),
+        # Кожен refresh будує свій payload у тому ж циклі — це CPU, не очікування
+        "per_refresh_ms": round(wall_ms / len(latencies), 3),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p99_ms": round(ordered[int(len(ordered) * 0.99) - 1], 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def async_bench(count: int, delay: float) -> list[dict[str, Any]]:
+    proxy = StandInProxy(replay.synthetic_document(dt_util.now(replay.TZ_KYIV).date(), True), delay)
+    await proxy.start()
+    results: list[dict[str, Any]] = []
+    try:
+        with tempfile.TemporaryDirectory() as storage:
+            async with async_test_home_assistant(storage_dir=storage) as hass:
+                region, queue = ENTRY
+                coordinators = [
+                    SvitloCoordinator(
+                        hass, {CONF_REGION: region, CONF_QUEUE: queue, "entry_id": f"bench{i}"}
+                    )
+                    for i in range(count)
+                ]
+                shared = hass.data[DOMAIN]["_shared_api"]
+                shared["client"] = SvitloClient(hass, [proxy.url])
+
+                for name in ("cold", "warm", "expired"):
+                    if name == "expired":
+                        # Копія «постаріла» — наступна хвиля має оновити її рівно одним запитом
+                        shared["doc"] = shared["doc"]._replace(
+                            fetched_utc=dt_util.utcnow() - timedelta(seconds=MIN_REUSE_SECONDS + 1)
+                        )
+                    hits_before = proxy.hits
+                    latencies, wall_ms = await _wave(coordinators)
+                    failed = sum(not c.last_update_success for c in coordinators)
+                    results.append(
+                        _summary(name, proxy.hits - hits_before, latencies, wall_ms, failed)
+                    )
+
+                for coordinator in coordinators:
+                    await coordinator.async_shutdown()
+                await hass.async_stop(force=True)
+    finally:
+        await proxy.stop()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--coordinators", type=int, default=300)
+    parser.add_argument("--delay-ms", type=float, default=50, help="затримка відповіді замінника")
+    parser.add_argument(
+        "--wait-budget-ms", type=float, default=250,
+        help="допустиме очікування понад запит і побудову payload'ів (холодна/прострочена хвиля)",
+    )
+    parser.add_argument(
+        "--warm-budget-ms", type=float, default=2,
+        help="допустимий середній час одного refresh зі свіжого кешу",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(async_bench(args.coordinators, args.delay_ms / 1000))
+
+    # Чисто CPU-частина хвилі: побудова payload'ів усіх координаторів зі свіжого кешу
+    build_ms = next(res["wall_ms"] for res in results if res["wave"] == "warm")
+    wait_limit = round(args.delay_ms + build_ms + args.wait_budget_ms, 2)
+
+    failures: list[str] = []
+    for res in results:
+        expected = 0 if res["wave"] == "warm" else 1
+        if res["network_requests"] != expected:
+            failures.append(f"{res['wave']}: {res['network_requests']} requests, expected {expected}")
+        if res["failed"]:
+            failures.append(f"{res['wave']}: {res['failed']} coordinator(s) failed to refresh")
+        if res["wave"] == "warm":
+            if res["per_refresh_ms"] > args.warm_budget_ms:
+                failures.append(
+                    f"warm: {res['per_refresh_ms']} ms per refresh > {args.warm_budget_ms} ms"
+                )
+        elif res["max_ms"] > wait_limit:
+            failures.append(f"{res['wave']}: max wait {res['max_ms']} ms > {wait_limit} ms")
+
+    report = {
+        "coordinators": args.coordinators,
+        "wait_limit_ms": wait_limit,
+        "waves": results,
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Startup benchmark for Svitlo Live: import time and time-to-first-state.
+
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --sizes 1 20 --repeat 7 --max-import-ms 50
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DAY = date(2025, 11, 17)
+PACKAGE = "custom_components.svitlo_live"
+
+# Те, що HA вже має в пам'яті на момент імпорту кастомної інтеграції
+BASELINE_MODULES = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.device_registry",
+    "homeassistant.helpers.dispatcher",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.entity_registry",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.components.http",
+    "homeassistant.components.websocket_api",
+)
+
+# Модулі пакета в порядку, в якому їх вантажить HA
+IMPORT_ORDER = (
+    PACKAGE,
+    f"{PACKAGE}.config_flow",
+    f"{PACKAGE}.binary_sensor",
+    f"{PACKAGE}.sensor",
+    f"{PACKAGE}.calendar",
+)
+
+# Чого не має тягнути імпорт пакета: рекордер і календар HA — лише за потреби,
+# парсерів HTML інтеграція не використовує зовсім
+FORBIDDEN_ON_PACKAGE_IMPORT = (
+    "homeassistant.components.recorder",
+    "homeassistant.components.calendar",
+    "bs4",
+)
+
+
+def _child_import() -> dict[str, Any]:
+    sys.path.insert(0, str(REPO_ROOT))
+    for name in BASELINE_MODULES:
+        importlib.import_module(name)
+
+    import_ms: dict[str, float] = {}
+    pulled: dict[str, list[str]] = {}
+    for name in IMPORT_ORDER:
+        before = set(sys.modules)
+        started = time.perf_counter()
+        importlib.import_module(name)
+        import_ms[name] = round((time.perf_counter() - started) * 1000, 2)
+        added = set(sys.modules) - before
+        pulled[name] = sorted(
+            mod for mod in added
+            if not mod.startswith(PACKAGE) and mod.count(".") <= 2
+        )
+    return {"import_ms": import_ms, "pulled": pulled}
+
+
+async def _async_child_first_state(count: int) -> dict[str, Any]:
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    import replay  # noqa: PLC0415  (replay імпортує інтеграцію — лише в дочірньому процесі)
+
+    from homeassistant.const import EVENT_STATE_CHANGED
+    from homeassistant.core import callback
+    from homeassistant.helpers import entity_registry as er
+    from pytest_homeassistant_custom_component.common import async_test_home_assistant
+
+    from custom_components.svitlo_live.config_flow import _queue_options_for_region
+    from custom_components.svitlo_live.const import DOMAIN, REGIONS
+
+    pairs = [
+        (region, queue) for region in REGIONS for queue in _queue_options_for_region(region)[0]
+    ][:count]
+    timeline = replay.synthetic_timeline(DAY, 1)
+    source = replay.TimelineSource(timeline)
+    stats = replay.ReplayStats()
+    first_state: list[float] = []
+
+    with tempfile.TemporaryDirectory() as storage:
+        async with async_test_home_assistant(storage_dir=storage) as hass:
+            clock = replay.VirtualClock(hass.loop, source.start + timedelta(hours=12))
+
+            @callback
+            def _on_state(event) -> None:
+                if not first_state and event.data["entity_id"].split(".", 1)[1].startswith("svitlo"):
+                    first_state.append(time.perf_counter())
+
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _on_state)
+            with clock.installed(), replay._instrumented(stats, clock, source):
+                await hass.async_block_till_done()
+                started = time.perf_counter()
+                await replay.async_setup_entries(hass, pairs)
+                await hass.async_block_till_done()
+                ready = time.perf_counter()
+                entity_ids = [
+                    e.entity_id
+                    for e in er.async_get(hass).entities.values()
+                    if e.platform == DOMAIN and not e.disabled
+                ]
+                missing = [eid for eid in entity_ids if hass.states.get(eid) is None]
+                await hass.async_stop(force=True)
+
+    return {
+        "entries": count,
+        "entities": len(entity_ids),
+        "without_state": len(missing),
+        "first_state_ms": round((first_state[0] - started) * 1000, 1) if first_state else None,
+        "all_states_ms": round((ready - started) * 1000, 1),
+    }
+
+
+def _run_child(*args: str) -> dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, __file__, *args], capture_output=True, text=True, check=False
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"child {' '.join(args)} failed\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 20])
+    parser.add_argument("--repeat", type=int, default=5, help="дочірніх процесів на замір (медіана)")
+    parser.add_argument(
+        "--max-import-ms", type=float, default=50,
+        help="стеля імпорту пакета (без платформ), мс",
+    )
+    parser.add_argument(
+        "--max-first-state-ms", type=float, default=1500,
+        help="стеля часу до першого стану (1 entry), мс",
+    )
+    parser.add_argument("--child-import", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--child-first-state", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_import:
+        print(json.dumps(_child_import()))
+        return
+    if args.child_first_state is not None:
+        print(json.dumps(asyncio.run(_async_child_first_state(args.child_first_state))))
+        return
+
+    failures: list[str] = []
+
+    # Кожен замір — у свіжому інтерпретаторі: інакше модулі вже в sys.modules
+    imports = [_run_child("--child-import") for _ in range(args.repeat)]
+    import_ms = {
+        name: statistics.median(run["import_ms"][name] for run in imports) for name in IMPORT_ORDER
+    }
+    pulled = imports[0]["pulled"]
+    if import_ms[PACKAGE] > args.max_import_ms:
+        failures.append(f"package import {import_ms[PACKAGE]} ms > {args.max_import_ms} ms")
+    for mod in pulled[PACKAGE]:
+        if mod.startswith(FORBIDDEN_ON_PACKAGE_IMPORT):
+            failures.append(f"package import pulls {mod}")
+
+    first_state: list[dict[str, Any]] = []
+    for size in args.sizes:
+        runs = [_run_child("--child-first-state", str(size)) for _ in range(args.repeat)]
+        res = dict(runs[0])
+        for key in ("first_state_ms", "all_states_ms"):
+            values = [run[key] for run in runs if run[key] is not None]
+            res[key] = statistics.median(values) if values else None
+        first_state.append(res)
+        if res["without_state"] or res["first_state_ms"] is None:
+            failures.append(f"{size} entries: {res['without_state']} entities without state")
+        elif size == 1 and res["first_state_ms"] > args.max_first_state_ms:
+            failures.append(
+                f"first state after {res['first_state_ms']} ms > {args.max_first_state_ms} ms"
+            )
+
+    report = {
+        "import_ms": import_ms,
+        "pulled_components": {
+            name: [mod for mod in mods if mod.startswith("homeassistant.components.")]
+            for name, mods in pulled.items()
+        },
+        "time_to_first_state": first_state,
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Wire-format benchmark for Svitlo Live: JSON vs compact SVP1.
+
+    python scripts/bench_wire_format.py
+    python scripts/bench_wire_format.py --min-size-ratio 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Any, Callable
+
+from aiohttp import web
+
+import replay  # noqa: E402  (той самий каталог; додає корінь репо в sys.path)
+
+from homeassistant.util.json import json_loads  # noqa: E402
+from pytest_homeassistant_custom_component.common import async_test_home_assistant  # noqa: E402
+
+from custom_components.svitlo_live.client import SvitloClient  # noqa: E402
+from custom_components.svitlo_live.wire import (  # noqa: E402
+    PACKED_CONTENT_TYPE,
+    decode_packed,
+    encode_packed,
+    slot_codes,
+)
+
+DAY = date(2025, 11, 17)
+
+
+class StandInProxy:
+    """Локальний замінник проксі: SVP1, якщо його просять в Accept (і `packed`), інакше JSON."""
+
+    def __init__(self, document: dict[str, Any], packed: bool = True, broken: bool = False) -> None:
+        self.json_body = json.dumps(document).encode()
+        self.packed_body = encode_packed(document)
+        if broken:
+            self.packed_body = self.packed_body[:-5]
+        self.packed = packed
+        self.served: list[str] = []
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        if self.packed and PACKED_CONTENT_TYPE in request.headers.get("Accept", ""):
+            self.served.append("svp1")
+            return web.Response(body=self.packed_body, content_type=PACKED_CONTENT_TYPE)
+        self.served.append("json")
+        return web.Response(body=self.json_body, content_type="application/json")
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def _best_ms(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 3)
+
+
+def _build_all(document: dict[str, Any]) -> int:
+    """Те, що робить координатор для кожної черги: слоти доби -> 48 кодів."""
+    count = 0
+    for region in document["regions"]:
+        for per_date in region["schedule"].values():
+            for slots in per_date.values():
+                count += len(slot_codes(slots))
+    return count
+
+
+async def _async_fetch_with(proxy: StandInProxy, fetches: int) -> tuple[list[str], list[str]]:
+    """Кілька фетчів одним клієнтом: (що віддав замінник, помилки клієнта)."""
+    await proxy.start()
+    errors: list[str] = []
+    try:
+        with tempfile.TemporaryDirectory() as storage:
+            async with async_test_home_assistant(storage_dir=storage) as hass:
+                client = SvitloClient(hass, [proxy.url])
+                for _ in range(fetches):
+                    try:
+                        document = await client.async_fetch_json()
+                        assert document["regions"], "empty document"
+                    except Exception as e:  # noqa: BLE001 — фіксуємо в звіті
+                        errors.append(f"{type(e).__name__}: {e}")
+                await hass.async_stop(force=True)
+    finally:
+        await proxy.stop()
+    return proxy.served, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--min-size-ratio", type=float, default=10,
+        help="у скільки разів SVP1 має бути меншим за JSON (без стиснення)",
+    )
+    args = parser.parse_args()
+
+    document = replay.synthetic_document(DAY, True)
+    json_body = json.dumps(document).encode()
+    packed_body = encode_packed(document)
+    decoded = {"json": json_loads(json_body), "svp1": decode_packed(packed_body)}
+
+    formats = {
+        "json": {
+            "bytes": len(json_body),
+            "gzip_bytes": len(gzip.compress(json_body)),
+            "decode_ms": _best_ms(lambda: json_loads(json_body), args.repeat),
+            "build_ms": _best_ms(lambda: _build_all(decoded["json"]), args.repeat),
+        },
+        "svp1": {
+            "bytes": len(packed_body),
+            "gzip_bytes": len(gzip.compress(packed_body)),
+            "decode_ms": _best_ms(lambda: decode_packed(packed_body), args.repeat),
+            "build_ms": _best_ms(lambda: _build_all(decoded["svp1"]), args.repeat),
+        },
+    }
+
+    negotiation = {
+        "svp1_proxy": asyncio.run(_async_fetch_with(StandInProxy(document), 2)),
+        "json_only_proxy": asyncio.run(_async_fetch_with(StandInProxy(document, packed=False), 2)),
+        "broken_svp1_proxy": asyncio.run(_async_fetch_with(StandInProxy(document, broken=True), 2)),
+    }
+
+    failures: list[str] = []
+    if _build_all(decoded["json"]) != _build_all(decoded["svp1"]) or any(
+        slot_codes(a) != b
+        for ra, rb in zip(decoded["json"]["regions"], decoded["svp1"]["regions"])
+        for qa, qb in zip(ra["schedule"].values(), rb["schedule"].values())
+        for a, b in zip(qa.values(), qb.values())
+    ):
+        failures.append("SVP1 round trip differs from JSON")
+    ratio = formats["json"]["bytes"] / formats["svp1"]["bytes"]
+    if ratio < args.min_size_ratio:
+        failures.append(f"SVP1 only {ratio:.1f}x smaller than JSON (< {args.min_size_ratio}x)")
+    for key in ("decode_ms", "build_ms"):
+        if formats["svp1"][key] > formats["json"][key]:
+            failures.append(f"SVP1 {key} {formats['svp1'][key]} > JSON {formats['json'][key]}")
+    expected = {
+        "svp1_proxy": (["svp1", "svp1"], 0),
+        "json_only_proxy": (["json", "json"], 0),
+        # Битий SVP1 — той самий фетч одразу перепитує дзеркало в JSON, далі лише JSON
+        "broken_svp1_proxy": (["svp1", "json", "json"], 0),
+    }
+    for name, (served, errors) in negotiation.items():
+        want_served, want_errors = expected[name]
+        if served != want_served or len(errors) != want_errors:
+            failures.append(f"{name}: served {served}, errors {errors}")
+
+    report = {
+        "formats": formats,
+        "size_ratio": round(ratio, 1),
+        "negotiation": {name: {"served": s, "errors": e} for name, (s, e) in negotiation.items()},
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
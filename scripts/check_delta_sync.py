@@ -0,0 +1,213 @@
+"""Check for delta sync against a versioned stand-in proxy.
+
+    python scripts/check_delta_sync.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import tempfile
+from datetime import date
+from typing import Any, Optional
+
+from aiohttp import web
+
+import replay  # noqa: E402  (той самий каталог; додає корінь репо в sys.path)
+
+from pytest_homeassistant_custom_component.common import async_test_home_assistant  # noqa: E402
+
+from custom_components.svitlo_live.client import SvitloClient, _queues_checksum  # noqa: E402
+from custom_components.svitlo_live.wire import slot_codes  # noqa: E402
+
+DAY = date(2025, 11, 17)
+REGIONS = ["kyiv", "kiivska-oblast", "lvivska-oblast"]
+
+# Наскільки оцінка розміру документа після патча може відхилятися від справжнього
+SIZE_TOLERANCE = 0.2
+
+# (крок, документ, як зіпсувати патч, що має віддати замінник)
+STEPS: list[tuple[str, dict[str, Any], Optional[str], list[str]]] = [
+    ("initial", replay.synthetic_document(DAY, False, regions=REGIONS), None, ["full"]),
+    ("unchanged", {}, None, ["304"]),
+    ("tomorrow_published", replay.synthetic_document(DAY, True, regions=REGIONS), None, ["patch"]),
+    (
+        "today_revised_bad_checksum",
+        replay.synthetic_document(DAY, True, revision=1, regions=REGIONS),
+        "checksum",
+        ["patch", "full"],
+    ),
+    (
+        "tomorrow_withdrawn_wrong_base",
+        replay.synthetic_document(DAY, False, revision=1, regions=REGIONS),
+        "base",
+        ["patch", "full"],
+    ),
+    (
+        "tomorrow_republished",
+        replay.synthetic_document(DAY, True, revision=1, regions=REGIONS),
+        None,
+        ["patch"],
+    ),
+]
+
+
+def _make_patch(old: dict[str, Any], new: dict[str, Any], base: str) -> dict[str, Any]:
+    """Патч у форматі проксі: змінені черги з новими/знятими датами + контрольна сума."""
+    old_regions = {r["cpu"]: r["schedule"] for r in old["regions"]}
+    changes: list[dict[str, Any]] = []
+    for region in new["regions"]:
+        before = old_regions.get(region["cpu"], {})
+        for queue, per_date in region["schedule"].items():
+            prev = before.get(queue, {})
+            dates: dict[str, Any] = {
+                day: slots for day, slots in per_date.items() if prev.get(day) != slots
+            }
+            dates.update({day: None for day in prev if day not in per_date})
+            if dates:
+                changes.append({"cpu": region["cpu"], "queue": queue, "dates": dates})
+    return {
+        "type": "patch",
+        "base_version": base,
+        "version": new["version"],
+        "date_today": new["date_today"],
+        "date_tomorrow": new["date_tomorrow"],
+        "changes": changes,
+        "checksum": _queues_checksum(new, [(c["cpu"], c["queue"]) for c in changes]),
+    }
+
+
+class StandInProxy:
+    """Локальний замінник проксі з версіями: 304, патч або повний документ."""
+
+    def __init__(self) -> None:
+        self.versions: dict[str, dict[str, Any]] = {}
+        self.current: Optional[str] = None
+        self.corrupt: Optional[str] = None
+        self.served: list[str] = []
+        self.bytes: dict[str, int] = {}
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def publish(self, document: dict[str, Any]) -> None:
+        version = f"v{len(self.versions) + 1}"
+        self.versions[version] = {**document, "version": version}
+        self.current = version
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        since = request.query.get("since")
+        latest = self.versions[self.current]
+        if since == self.current:
+            self.served.append("304")
+            return web.Response(status=304)
+        if since in self.versions:
+            patch = _make_patch(self.versions[since], latest, since)
+            if self.corrupt == "checksum":
+                patch["checksum"] = "0" * 64
+            elif self.corrupt == "base":
+                patch["base_version"] = "v0"
+            return self._answer("patch", patch)
+        return self._answer("full", latest)
+
+    def _answer(self, kind: str, payload: dict[str, Any]) -> web.Response:
+        body = json.dumps(payload).encode()
+        self.served.append(kind)
+        self.bytes[kind] = max(self.bytes.get(kind, 0), len(body))
+        return web.Response(body=body, content_type="application/json")
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def _normalised(document: dict[str, Any]) -> dict[str, Any]:
+    """Документ у порівнюваній формі: дати, версія та 48 кодів на кожну чергу/добу."""
+    return {
+        "date_today": document.get("date_today"),
+        "date_tomorrow": document.get("date_tomorrow"),
+        "version": document.get("version"),
+        "slots": {
+            f"{r['cpu']}/{queue}/{day}": slot_codes(slots)
+            for r in document["regions"]
+            for queue, per_date in r["schedule"].items()
+            for day, slots in per_date.items()
+        },
+    }
+
+
+async def async_check() -> tuple[list[dict[str, Any]], dict[str, int]]:
+    proxy = StandInProxy()
+    await proxy.start()
+    steps: list[dict[str, Any]] = []
+    try:
+        with tempfile.TemporaryDirectory() as storage:
+            async with async_test_home_assistant(storage_dir=storage) as hass:
+                client = SvitloClient(hass, [proxy.url])
+                for name, document, corrupt, expected in STEPS:
+                    if document:
+                        proxy.publish(document)
+                    proxy.corrupt = corrupt
+                    served_before = len(proxy.served)
+                    error: Optional[str] = None
+                    matches = False
+                    try:
+                        fetched = await client.async_fetch_json()
+                        matches = _normalised(fetched) == _normalised(
+                            proxy.versions[proxy.current]
+                        )
+                    except Exception as e:  # noqa: BLE001 — фіксуємо в звіті
+                        error = f"{type(e).__name__}: {e}"
+                    steps.append({
+                        "step": name,
+                        "served": proxy.served[served_before:],
+                        "expected": expected,
+                        "matches_published": matches,
+                        "document_size": client.document_size,
+                        "published_size": len(json.dumps(proxy.versions[proxy.current])),
+                        "error": error,
+                    })
+                await hass.async_stop(force=True)
+    finally:
+        await proxy.stop()
+    return steps, proxy.bytes
+
+
+def main() -> None:
+    steps, sizes = asyncio.run(async_check())
+
+    failures: list[str] = []
+    for step in steps:
+        if step["error"] or not step["matches_published"]:
+            failures.append(
+                f"{step['step']}: document differs from the published one ({step['error']})"
+            )
+        published = step["published_size"]
+        if abs(step["document_size"] - published) > published * SIZE_TOLERANCE:
+            failures.append(
+                f"{step['step']}: document_size {step['document_size']} B, "
+                f"published document {published} B"
+            )
+        if step["served"] != step["expected"]:
+            failures.append(f"{step['step']}: served {step['served']}, expected {step['expected']}")
+    if sizes.get("patch", 0) >= sizes.get("full", 0):
+        failures.append(
+            f"patch ({sizes.get('patch')} B) not smaller than "
+            f"the full document ({sizes.get('full')} B)"
+        )
+
+    print(json.dumps({"steps": steps, "max_body_bytes": sizes, "failures": failures}, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Check for hedged fetches across Svitlo Live API mirrors.
+
+    python scripts/check_mirror_hedging.py
+    python scripts/check_mirror_hedging.py --slow-ms 8000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Any, Optional
+
+from aiohttp import web
+
+import replay  # noqa: E402  (той самий каталог; додає корінь репо в sys.path)
+
+from pytest_homeassistant_custom_component.common import async_test_home_assistant  # noqa: E402
+
+from custom_components.svitlo_live.client import (  # noqa: E402
+    HEDGE_DEFAULT_DELAY,
+    SvitloClient,
+)
+
+DAY = date(2025, 11, 17)
+FAST_DELAY = 0.05
+
+
+class StandInMirror:
+    """Локальний замінник дзеркала: відповідає із затримкою або заданим HTTP-статусом."""
+
+    def __init__(self, body: bytes, delay: float = FAST_DELAY, status: int = 200) -> None:
+        self.body = body
+        self.delay = delay
+        self.status = status
+        self.hits = 0
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.Response(status=self.status)
+        return web.Response(body=self.body, content_type="application/json")
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def _fetch_tasks_alive() -> int:
+    """Скільки запитів до дзеркал ще не завершились (мають бути 0 після фетчу)."""
+    return sum(
+        1
+        for task in asyncio.all_tasks()
+        if not task.done() and task.get_coro().__qualname__.endswith("._fetch_one")
+    )
+
+
+async def _async_fetch(
+    client: SvitloClient, mirrors: dict[str, StandInMirror]
+) -> dict[str, Any]:
+    """Один фетч: тривалість, хто скільки запитів отримав, чи впав, що лишилось висіти."""
+    hits_before = {name: m.hits for name, m in mirrors.items()}
+    error: Optional[str] = None
+    started = time.perf_counter()
+    try:
+        document = await client.async_fetch_json()
+        assert document["regions"], "empty document"
+    except Exception as e:  # noqa: BLE001 — фіксуємо в звіті
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - started
+    return {
+        "wall_s": round(wall, 3),
+        "hits": {name: m.hits - hits_before[name] for name, m in mirrors.items()},
+        "error": error,
+        "tasks_alive": _fetch_tasks_alive(),
+    }
+
+
+async def async_check(slow: float) -> dict[str, list[dict[str, Any]]]:
+    body = json.dumps(replay.synthetic_document(DAY, True)).encode()
+    scenarios: dict[str, list[str]] = {
+        "slow_primary": ["slow", "fast"],
+        "failing_primary": ["failing", "fast"],
+        "all_failing": ["failing", "failing2"],
+    }
+    results: dict[str, list[dict[str, Any]]] = {}
+    with tempfile.TemporaryDirectory() as storage:
+        async with async_test_home_assistant(storage_dir=storage) as hass:
+            for name, order in scenarios.items():
+                mirrors = {
+                    "slow": StandInMirror(body, delay=slow),
+                    "fast": StandInMirror(body),
+                    "failing": StandInMirror(body, status=500),
+                    "failing2": StandInMirror(body, status=500),
+                }
+                mirrors = {key: mirrors[key] for key in order}
+                for mirror in mirrors.values():
+                    await mirror.start()
+                try:
+                    client = SvitloClient(hass, [m.url for m in mirrors.values()])
+                    results[name] = [await _async_fetch(client, mirrors) for _ in range(2)]
+                finally:
+                    for mirror in mirrors.values():
+                        await mirror.stop()
+            await hass.async_stop(force=True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--slow-ms", type=int, default=5000,
+        help="затримка повільного дзеркала; має бути більшою за затримку хеджування",
+    )
+    args = parser.parse_args()
+    slow = args.slow_ms / 1000
+    if slow <= HEDGE_DEFAULT_DELAY:
+        parser.error(f"--slow-ms must exceed the hedge delay ({HEDGE_DEFAULT_DELAY} s)")
+
+    results = asyncio.run(async_check(slow))
+
+    failures: list[str] = []
+    for name, fetches in results.items():
+        for n, res in enumerate(fetches, 1):
+            if res["tasks_alive"]:
+                failures.append(f"{name} #{n}: {res['tasks_alive']} mirror request(s) left running")
+
+    first, second = results["slow_primary"]
+    if first["error"] or first["hits"] != {"slow": 1, "fast": 1}:
+        failures.append(f"slow_primary #1: expected a hedge to the fast mirror, got {first}")
+    elif not HEDGE_DEFAULT_DELAY <= first["wall_s"] < slow:
+        failures.append(f"slow_primary #1: {first['wall_s']} s, expected hedge-delay bound")
+    if second["error"] or second["hits"] != {"slow": 0, "fast": 1}:
+        failures.append(f"slow_primary #2: expected the fast mirror only, got {second}")
+
+    for n, res in enumerate(results["failing_primary"], 1):
+        if res["error"] or res["hits"]["fast"] != 1:
+            failures.append(f"failing_primary #{n}: expected the fast mirror to answer, got {res}")
+        elif res["wall_s"] >= HEDGE_DEFAULT_DELAY:
+            failures.append(f"failing_primary #{n}: waited {res['wall_s']} s for the hedge delay")
+
+    for n, res in enumerate(results["all_failing"], 1):
+        if res["error"] is None:
+            failures.append(f"all_failing #{n}: fetch succeeded with every mirror down")
+
+    print(json.dumps({"results": results, "failures": failures}, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Check for SSE push updates with fallback to polling.
+
+    python scripts/check_push.py
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+import tempfile
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+
+import replay  # noqa: E402  (той самий каталог; додає корінь репо в sys.path)
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.common import async_test_home_assistant  # noqa: E402
+
+from custom_components.svitlo_live.client import SvitloClient  # noqa: E402
+from custom_components.svitlo_live.const import CONF_QUEUE, CONF_REGION, DOMAIN  # noqa: E402
+from custom_components.svitlo_live.coordinator import (  # noqa: E402
+    MIN_REUSE_SECONDS,
+    PUSH_MAX_REUSE_SECONDS,
+    SvitloCoordinator,
+    async_apply_shared_json,
+)
+from custom_components.svitlo_live.push import (  # noqa: E402
+    RECONNECT_MIN_SECONDS,
+    SvitloPushListener,
+)
+
+ENTRY = ("kyiv", "1.1")
+# Подію пишемо дрібними шматками — слухач має склеїти рядок `data:` сам
+CHUNK_BYTES = 1024
+
+
+class StandInProxy:
+    """Локальний замінник проксі: JSON для опитування і SSE-потік, яким керує перевірка."""
+
+    def __init__(self, document: dict[str, Any]) -> None:
+        self.body = json.dumps(document).encode()
+        self.hits = 0
+        self.streams = 0
+        self._outbox: Optional[asyncio.Queue[Optional[bytes]]] = None
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.hits += 1
+        return web.Response(body=self.body, content_type="application/json")
+
+    async def _handle_events(self, request: web.Request) -> web.StreamResponse:
+        self.streams += 1
+        outbox: asyncio.Queue[Optional[bytes]] = asyncio.Queue()
+        self._outbox = outbox
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        # Заголовки вже пішли, але жодного рядка ще нема
+        while (raw := await outbox.get()) is not None:
+            for i in range(0, len(raw), CHUNK_BYTES):
+                await resp.write(raw[i:i + CHUNK_BYTES])
+        return resp
+
+    async def send(self, raw: bytes) -> None:
+        assert self._outbox is not None, "no stream open"
+        await self._outbox.put(raw)
+
+    async def send_document(self, document: dict[str, Any]) -> None:
+        await self.send(b"event: schedule\ndata: " + json.dumps(document).encode() + b"\n\n")
+
+    async def drop(self) -> None:
+        if self._outbox is not None:
+            await self._outbox.put(None)
+            self._outbox = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/", self._handle)
+        app.router.add_get("/events", self._handle_events)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        await self.drop()
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+async def _until(predicate: Callable[[], bool], timeout: float) -> bool:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(0.02)
+    return True
+
+
+async def async_check() -> list[dict[str, Any]]:
+    today = dt_util.now(replay.TZ_KYIV).date()
+    proxy = StandInProxy(replay.synthetic_document(today, False))
+    await proxy.start()
+    steps: list[dict[str, Any]] = []
+
+    def _step(name: str, ok: bool, **details: Any) -> None:
+        steps.append({"step": name, "ok": ok, "polls": proxy.hits, **details})
+
+    try:
+        with tempfile.TemporaryDirectory() as storage:
+            async with async_test_home_assistant(storage_dir=storage) as hass:
+                region, queue = ENTRY
+                coordinator = SvitloCoordinator(
+                    hass, {CONF_REGION: region, CONF_QUEUE: queue, "entry_id": "push"}
+                )
+                hass.data[DOMAIN]["push"] = coordinator
+                shared = hass.data[DOMAIN]["_shared_api"]
+                shared["client"] = SvitloClient(hass, [proxy.url])
+                # Без вікон тиші — запуск біля півночі не має блокувати опитування
+                shared["budget"].blackouts = ()
+
+                pushed: list[int] = []
+
+                async def _on_document(document: dict[str, Any], size: int) -> None:
+                    pushed.append(size)
+                    await async_apply_shared_json(hass, document, size)
+
+                listener = SvitloPushListener(hass, f"{proxy.url}events", _on_document)
+                shared["push"] = listener
+                listener.start()
+
+                def _age(seconds: float) -> None:
+                    shared["doc"] = shared["doc"]._replace(
+                        fetched_utc=dt_util.utcnow() - timedelta(seconds=seconds)
+                    )
+
+                async def _refresh_polls() -> int:
+                    before = proxy.hits
+                    await coordinator.async_refresh()
+                    return proxy.hits - before
+
+                opened = await _until(lambda: proxy.streams == 1, 5)
+                await asyncio.sleep(0.2)
+                _step("stream_open_before_first_line", opened and not listener.connected,
+                      connected=listener.connected)
+
+                await proxy.send(b": ping\n\n")
+                _step("keepalive_marks_connected", await _until(lambda: listener.connected, 5))
+
+                polls = await _refresh_polls()
+                _step("first_refresh_polls", polls == 1 and coordinator.last_update_success,
+                      new_polls=polls)
+
+                await proxy.send_document(replay.synthetic_document(today, True))
+                applied = await _until(lambda: len(pushed) == 1, 5)
+                tomorrow = coordinator.data.tomorrow_date
+                _step("pushed_document_applied", applied and tomorrow is not None,
+                      tomorrow_date=tomorrow)
+
+                _age(MIN_REUSE_SECONDS + 1)
+                polls = await _refresh_polls()
+                _step("connected_refresh_reuses", polls == 0, new_polls=polls)
+
+                _age(PUSH_MAX_REUSE_SECONDS + 1)
+                polls = await _refresh_polls()
+                _step("stale_document_polled_while_connected", polls == 1, new_polls=polls)
+
+                await proxy.drop()
+                disconnected = await _until(lambda: not listener.connected, 5)
+                _age(MIN_REUSE_SECONDS + 1)
+                polls = await _refresh_polls()
+                _step("dropped_stream_falls_back_to_polling", disconnected and polls == 1,
+                      new_polls=polls)
+
+                reopened = await _until(lambda: proxy.streams == 2, RECONNECT_MIN_SECONDS + 10)
+                if reopened:
+                    await proxy.send_document(replay.synthetic_document(today, True, revision=1))
+                applied = reopened and await _until(lambda: len(pushed) == 2, 5)
+                _step("reconnects_and_applies_next_push", applied and listener.connected,
+                      streams=proxy.streams)
+
+                await listener.async_stop()
+                await coordinator.async_shutdown()
+                await hass.async_stop(force=True)
+    finally:
+        await proxy.stop()
+    return steps
+
+
+def main() -> None:
+    steps = asyncio.run(async_check())
+    failures = [step["step"] for step in steps if not step["ok"]]
+    print(json.dumps({"steps": steps, "failures": failures}, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
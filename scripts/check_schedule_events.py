@@ -0,0 +1,50 @@
+"""Check for ``svitlo_live_schedule_changed`` across midnight rollovers.
+
+    python scripts/check_schedule_events.py
+    python scripts/check_schedule_events.py --days 7 --entry kyiv:1.1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date
+
+import replay  # noqa: E402  (той самий каталог; додає корінь репо в sys.path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--days", type=int, default=4)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 11, 17))
+    parser.add_argument("--entry", type=replay._parse_entry, action="append", dest="entries")
+    args = parser.parse_args()
+
+    entries = args.entries or [("kyiv", "1.1"), ("lvivska-oblast", "2.1")]
+    stats = asyncio.run(
+        replay.async_replay(replay.synthetic_timeline(args.start, args.days), entries)
+    )
+
+    failures: list[str] = []
+    if stats.rollovers < len(entries) * (args.days - 1):
+        failures.append(f"only {stats.rollovers} rollovers simulated")
+    if stats.empty_schedule_change_events:
+        failures.append(
+            f"{stats.empty_schedule_change_events} schedule_changed events without slot changes"
+        )
+    if not stats.schedule_change_events - stats.empty_schedule_change_events:
+        failures.append("real schedule changes did not fire the event")
+
+    report = {
+        "rollovers": stats.rollovers,
+        "schedule_change_events": stats.schedule_change_events,
+        "empty_schedule_change_events": stats.empty_schedule_change_events,
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
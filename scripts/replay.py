@@ -0,0 +1,453 @@
+"""Replay / timeline simulator for Svitlo Live.
+
+    python scripts/replay.py --days 7 --entry kiivska-oblast:3.2 --entry kyiv:1.1
+    python scripts/replay.py --record-dir /config/svitlo_records --entry kyiv:1.1
+    python scripts/replay.py --max-fetches-per-hour 2 --blackout 00:00-00:05 --blackout 03:00-06:00
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import inspect
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from unittest.mock import Mock, patch
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.core import HomeAssistant, callback  # noqa: E402  (першим — цикл імпортів loader)
+from homeassistant import loader  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.helpers import entity as entity_helper  # noqa: E402
+from homeassistant.helpers import event as event_helper  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+    async_test_home_assistant,
+    mock_component,
+)
+
+from custom_components.svitlo_live import coordinator as coordinator_module  # noqa: E402
+from custom_components.svitlo_live.config_flow import _queue_options_for_region  # noqa: E402
+from custom_components.svitlo_live.const import (  # noqa: E402
+    CONF_BLACKOUT_WINDOWS,
+    CONF_END,
+    CONF_EVENT_LEAD_TIMES,
+    CONF_MAX_FETCHES_PER_DAY,
+    CONF_MAX_FETCHES_PER_HOUR,
+    CONF_QUEUE,
+    CONF_REGION,
+    CONF_START,
+    DOMAIN,
+    EVENT_OUTAGE_UPCOMING,
+    EVENT_POWER_RETURNING,
+    EVENT_SCHEDULE_CHANGED,
+    REGIONS,
+)
+from custom_components.svitlo_live.snapshots import load_snapshots  # noqa: E402
+
+TZ_KYIV = dt_util.get_time_zone("Europe/Kyiv")
+
+# Компоненти-залежності, які не потрібні для симуляції (без HTTP-сервера тощо)
+MOCKED_DEPENDENCIES = ("http", "websocket_api")
+
+
+# ---------------------------------------------------------------------------
+# Синтетичні дані
+# ---------------------------------------------------------------------------
+
+def _slots_for(day: date, region: str, queue: str, revision: int = 0) -> dict[str, int]:
+    seed = hashlib.sha1(f"{day}|{region}|{queue}|{revision}".encode()).digest()
+    rnd = random.Random(seed)
+    states = [1] * 48
+    # 1–3 блоки відключень по 1.5–4 год
+    for _ in range(rnd.randint(1, 3)):
+        start = rnd.randrange(0, 48)
+        for i in range(start, min(48, start + rnd.randint(3, 8))):
+            states[i] = 2
+    return {f"{i // 2:02d}:{30 if i % 2 else 0:02d}": code for i, code in enumerate(states)}
+
+
+def synthetic_document(
+    day: date,
+    with_tomorrow: bool,
+    revision: int = 0,
+    regions: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    """Документ у форматі проксі: усі регіони, усі черги, сьогодні (+ завтра)."""
+    tomorrow = day + timedelta(days=1)
+    out_regions = []
+    for cpu in regions or list(REGIONS):
+        queues, _, _ = _queue_options_for_region(cpu)
+        schedule: dict[str, dict[str, dict[str, int]]] = {}
+        for queue in queues:
+            per_day = {day.isoformat(): _slots_for(day, cpu, queue, revision)}
+            if with_tomorrow:
+                per_day[tomorrow.isoformat()] = _slots_for(tomorrow, cpu, queue)
+            schedule[queue] = per_day
+        out_regions.append({"cpu": cpu, "name_ua": REGIONS[cpu], "schedule": schedule})
+    return {
+        "date_today": day.isoformat(),
+        "date_tomorrow": tomorrow.isoformat(),
+        "regions": out_regions,
+    }
+
+
+def _kyiv(day: date, hour: int, minute: int = 0) -> datetime:
+    return dt_util.as_utc(datetime(day.year, day.month, day.day, hour, minute, tzinfo=TZ_KYIV))
+
+
+def synthetic_timeline(start_day: date, days: int) -> list[tuple[datetime, dict[str, Any]]]:
+    """Публікації по днях: 00:00 — сьогодні, 12:00 — ревізія, 20:00 — + завтра."""
+    timeline = []
+    for n in range(days):
+        day = start_day + timedelta(days=n)
+        timeline.append((_kyiv(day, 0), synthetic_document(day, False)))
+        timeline.append((_kyiv(day, 12), synthetic_document(day, False, revision=1)))
+        timeline.append((_kyiv(day, 20), synthetic_document(day, True, revision=1)))
+    return timeline
+
+
+class TimelineSource:
+    """Віддає документ, опублікований на момент віртуального часу запиту."""
+
+    def __init__(self, timeline: list[tuple[datetime, dict[str, Any]]]) -> None:
+        self._times = [t for t, _ in timeline]
+        self._docs = [d for _, d in timeline]
+
+    @property
+    def start(self) -> datetime:
+        return self._times[0]
+
+    @property
+    def end(self) -> datetime:
+        return self._times[-1]
+
+    def document_at(self, when: datetime) -> dict[str, Any]:
+        idx = bisect.bisect_right(self._times, when) - 1
+        return self._docs[max(idx, 0)]
+
+
+# ---------------------------------------------------------------------------
+# Віртуальний годинник
+# ---------------------------------------------------------------------------
+
+class VirtualClock:
+    """Єдиний віртуальний час для dt_util, трекерів подій та таймерів event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, start_utc: datetime) -> None:
+        self._loop = loop
+        self.utc = start_utc
+        self._monotonic = loop.time()
+
+    def monotonic(self) -> float:
+        return self._monotonic
+
+    def utcnow(self) -> datetime:
+        return self.utc
+
+    def now(self, time_zone=None) -> datetime:
+        default_tz = getattr(dt_util, "get_default_time_zone", None)
+        tz = time_zone or (default_tz() if default_tz else dt_util.DEFAULT_TIME_ZONE)
+        return self.utc.astimezone(tz)
+
+    def timestamp(self) -> float:
+        return self.utc.timestamp()
+
+    def advance_to(self, monotonic: float) -> None:
+        delta = monotonic - self._monotonic
+        if delta > 0:
+            self._monotonic = monotonic
+            self.utc += timedelta(seconds=delta)
+
+    @contextlib.contextmanager
+    def installed(self) -> Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(patch.object(dt_util, "utcnow", self.utcnow))
+            stack.enter_context(patch.object(dt_util, "now", self.now))
+            # Трекери подій HA мають власні аліаси годинника (2023.x+)
+            if hasattr(event_helper, "time_tracker_utcnow"):
+                stack.enter_context(patch.object(event_helper, "time_tracker_utcnow", self.utcnow))
+            if hasattr(event_helper, "time_tracker_timestamp"):
+                stack.enter_context(patch.object(event_helper, "time_tracker_timestamp", self.timestamp))
+            if hasattr(event_helper, "time"):
+                stack.enter_context(patch.object(event_helper, "time", _VirtualTimeModule(self)))
+            stack.enter_context(patch.object(self._loop, "time", self.monotonic))
+            yield
+
+    async def run_until(self, hass: HomeAssistant, end_utc: datetime) -> None:
+        """Перескакує від таймера до таймера, доки віртуальний час не дійде до end_utc."""
+        end_monotonic = self._monotonic + (end_utc - self.utc).total_seconds()
+        while True:
+            await hass.async_block_till_done()
+            pending = [h.when() for h in self._loop._scheduled if not h.cancelled()]
+            next_when = min(pending, default=None)
+            if next_when is None or next_when > end_monotonic:
+                self.advance_to(end_monotonic)
+                await hass.async_block_till_done()
+                return
+            self.advance_to(next_when)
+            await asyncio.sleep(0)
+
+
+class _VirtualTimeModule:
+    """Замінник модуля `time` для helpers.event: лише time() — віртуальний."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self._clock = clock
+
+    def time(self) -> float:
+        return self._clock.timestamp()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(time, name)
+
+
+# ---------------------------------------------------------------------------
+# Лічильники
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ReplayStats:
+    fetches: int = 0
+    refreshes: int = 0
+    precise_ticks: int = 0
+    rollovers: int = 0
+    state_writes: int = 0
+    state_changes: int = 0
+    schedule_change_events: int = 0
+    empty_schedule_change_events: int = 0
+    off_boundary_changes: int = 0
+    lead_events: int = 0
+    mistimed_lead_events: int = 0
+    blackout_fetches: int = 0
+    writes_by_domain: Counter = field(default_factory=Counter)
+    fetch_times: list = field(default_factory=list)
+
+    def max_fetches_within(self, span: timedelta) -> int:
+        """Найбільше фетчів у будь-якому ковзному вікні тривалістю span."""
+        best = 0
+        for i, start in enumerate(self.fetch_times):
+            best = max(best, bisect.bisect_left(self.fetch_times, start + span) - i)
+        return best
+
+    def as_dict(self) -> dict[str, Any]:
+        res = {
+            k: v for k, v in self.__dict__.items() if k not in ("writes_by_domain", "fetch_times")
+        }
+        res["max_fetches_in_hour"] = self.max_fetches_within(timedelta(hours=1))
+        res["max_fetches_in_day"] = self.max_fetches_within(timedelta(days=1))
+        res["writes_by_domain"] = dict(self.writes_by_domain)
+        return res
+
+
+@contextlib.contextmanager
+def _instrumented(stats: ReplayStats, clock: VirtualClock, source: TimelineSource) -> Iterator[None]:
+    orig_write = entity_helper.Entity.async_write_ha_state
+    orig_update = coordinator_module.SvitloCoordinator._async_update_data
+    orig_track = coordinator_module.async_track_point_in_utc_time
+
+    def _write(self) -> None:
+        stats.state_writes += 1
+        stats.writes_by_domain[self.entity_id.split(".", 1)[0] if self.entity_id else "?"] += 1
+        orig_write(self)
+
+    async def _fetch(self) -> dict[str, Any]:
+        stats.fetches += 1
+        stats.fetch_times.append(clock.utc)
+        if self._shared_api["budget"].blackout_at(clock.utc) is not None:
+            stats.blackout_fetches += 1
+        return source.document_at(clock.utc)
+
+    async def _update(self) -> dict[str, Any]:
+        stats.refreshes += 1
+        return await orig_update(self)
+
+    def _track(hass, action, point_in_time):
+        counter = "rollovers" if getattr(action, "__name__", "") == "_async_rollover" else "precise_ticks"
+
+        @callback
+        def _counted(now) -> None:
+            setattr(stats, counter, getattr(stats, counter) + 1)
+            result = action(now)
+            if inspect.iscoroutine(result):
+                hass.async_create_task(result)
+
+        return orig_track(hass, _counted, point_in_time)
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch.object(entity_helper.Entity, "async_write_ha_state", _write))
+        stack.enter_context(
+            patch.object(coordinator_module.SvitloCoordinator, "_async_fetch_json", _fetch)
+        )
+        stack.enter_context(
+            patch.object(coordinator_module.SvitloCoordinator, "_async_update_data", _update)
+        )
+        stack.enter_context(patch.object(coordinator_module, "async_track_point_in_utc_time", _track))
+        yield
+
+
+# ---------------------------------------------------------------------------
+# Симуляція
+# ---------------------------------------------------------------------------
+
+async def async_setup_entries(
+    hass: HomeAssistant, entries: list[tuple[str, str]], config: Optional[dict[str, Any]] = None
+) -> None:
+    """Вантажить інтеграцію з робочого дерева та створює entry для кожної черги."""
+    hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+    for component in MOCKED_DEPENDENCIES:
+        mock_component(hass, component)
+    # calendar/ics реєструють HTTP view — сервер для симуляції не потрібен
+    hass.http = Mock()
+    assert await async_setup_component(hass, DOMAIN, {DOMAIN: config or {}})
+    for region, queue in entries:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"{region} / {queue}",
+            data={CONF_REGION: region, CONF_QUEUE: queue},
+            unique_id=f"{region}_{queue}",
+        )
+        entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(entry.entry_id)
+
+
+async def async_replay(
+    timeline: list[tuple[datetime, dict[str, Any]]],
+    entries: list[tuple[str, str]],
+    end_utc: Optional[datetime] = None,
+    lead_times: Optional[list[int]] = None,
+    hub_config: Optional[dict[str, Any]] = None,
+) -> ReplayStats:
+    source = TimelineSource(timeline)
+    # Стартуємо вранці першого дня (поза опівнічним вікном)
+    start_utc = source.start + timedelta(hours=7)
+    end_utc = end_utc or (source.end + timedelta(days=1))
+    stats = ReplayStats()
+    # Розкид ревалідації після rollover у координаторі — однаковий між запусками
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        # 2024.3: storage_dir, новіші версії: config_dir
+        params = inspect.signature(async_test_home_assistant).parameters
+        dir_kwarg = "config_dir" if "config_dir" in params else "storage_dir"
+        async with async_test_home_assistant(**{dir_kwarg: config_dir}) as hass:
+            clock = VirtualClock(hass.loop, start_utc)
+            with clock.installed(), _instrumented(stats, clock, source):
+
+                @callback
+                def _on_state(event) -> None:
+                    if not event.data["entity_id"].startswith("binary_sensor."):
+                        return
+                    old, new = event.data.get("old_state"), event.data.get("new_state")
+                    if old is None or new is None or old.state == new.state:
+                        return
+                    stats.state_changes += 1
+                    local = clock.now(TZ_KYIV)
+                    if local.minute % 30 or local.second > 5:
+                        stats.off_boundary_changes += 1
+
+                @callback
+                def _on_schedule_changed(event) -> None:
+                    stats.schedule_change_events += 1
+                    diffs = [event.data.get(key) for key in ("today", "tomorrow")]
+                    if not any(d["added"] or d["removed"] for d in diffs if d):
+                        stats.empty_schedule_change_events += 1
+
+                @callback
+                def _on_lead_event(event) -> None:
+                    stats.lead_events += 1
+                    target = dt_util.parse_datetime(
+                        event.data.get("starts_at") or event.data["returns_at"]
+                    )
+                    expected = target - timedelta(minutes=event.data["lead_minutes"])
+                    if abs((event.time_fired - expected).total_seconds()) > 5:
+                        stats.mistimed_lead_events += 1
+
+                hass.bus.async_listen(EVENT_STATE_CHANGED, _on_state)
+                hass.bus.async_listen(EVENT_SCHEDULE_CHANGED, _on_schedule_changed)
+                hass.bus.async_listen(EVENT_OUTAGE_UPCOMING, _on_lead_event)
+                hass.bus.async_listen(EVENT_POWER_RETURNING, _on_lead_event)
+
+                config = dict(hub_config or {})
+                if lead_times:
+                    config[CONF_EVENT_LEAD_TIMES] = lead_times
+                await async_setup_entries(hass, entries, config)
+                await clock.run_until(hass, end_utc)
+                await hass.async_stop(force=True)
+    return stats
+
+
+def _parse_entry(raw: str) -> tuple[str, str]:
+    region, _, queue = raw.partition(":")
+    if region not in REGIONS or not queue:
+        raise argparse.ArgumentTypeError(f"expected <region-slug>:<queue>, got {raw!r}")
+    return region, queue
+
+
+def _parse_blackout(raw: str) -> dict[str, str]:
+    start, _, end = raw.partition("-")
+    if not start or not end:
+        raise argparse.ArgumentTypeError(f"expected HH:MM-HH:MM, got {raw!r}")
+    return {CONF_START: start, CONF_END: end}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--record-dir", help="каталог зі знімками режиму запису")
+    parser.add_argument("--days", type=int, default=7, help="тривалість синтетичного таймлайну")
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 11, 17))
+    parser.add_argument("--entry", type=_parse_entry, action="append", dest="entries")
+    parser.add_argument(
+        "--lead-time", type=int, action="append", dest="lead_times",
+        help="event_lead_times у хвилинах (можна кілька разів)",
+    )
+    parser.add_argument("--max-fetches-per-hour", type=int, help="max_fetches_per_hour")
+    parser.add_argument("--max-fetches-per-day", type=int, help="max_fetches_per_day")
+    parser.add_argument(
+        "--blackout", type=_parse_blackout, action="append", dest="blackouts",
+        help="вікно тиші HH:MM-HH:MM за Києвом (можна кілька разів; замінює опівнічне)",
+    )
+    args = parser.parse_args()
+
+    hub_config: dict[str, Any] = {}
+    if args.max_fetches_per_hour:
+        hub_config[CONF_MAX_FETCHES_PER_HOUR] = args.max_fetches_per_hour
+    if args.max_fetches_per_day:
+        hub_config[CONF_MAX_FETCHES_PER_DAY] = args.max_fetches_per_day
+    if args.blackouts:
+        hub_config[CONF_BLACKOUT_WINDOWS] = args.blackouts
+
+    timeline = (
+        load_snapshots(args.record_dir)
+        if args.record_dir
+        else synthetic_timeline(args.start, args.days)
+    )
+    if not timeline:
+        parser.error("timeline is empty")
+    entries = args.entries or [("kiivska-oblast", "3.2")]
+
+    started = time.perf_counter()
+    stats = asyncio.run(
+        async_replay(timeline, entries, lead_times=args.lead_times, hub_config=hub_config)
+    )
+    report = stats.as_dict()
+    report["wall_seconds"] = round(time.perf_counter() - started, 2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()